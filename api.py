@@ -0,0 +1,190 @@
+import argparse, hashlib, threading
+from typing import Callable
+import numpy as np
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+from myapp import cubes, pipeline, recommend, store
+
+# Layanan query JSON tanpa Streamlit, memakai Pipeline (dataset + index) yang sama dengan dashboard:
+#   python api.py --port 8000
+#   curl 'http://127.0.0.1:8000/lowongan?provinsi=Jawa%20Barat&q=data&page=2'
+#   curl 'http://127.0.0.1:8000/recommend?q=data%20analyst&k=10'
+# Filter: posisi/provinsi/kota/mitra (boleh berulang), baru=1, keyword (deskripsi), q (global search), substring=1
+# provinsi/kota memakai nama ternormalisasi (lokasi.provinsi / lokasi.kota di item, mis. "Kota Bandung");
+# nilai facet yang tidak dikenal dijawab 400 beserta pilihan yang valid, bukan halaman kosong
+
+PER_PAGE = 20
+MAX_PER_PAGE = 200
+FACET_TOP = 20
+SUGGEST_MAX = 10
+FACETS = ("posisi", "provinsi", "kota", "mitra")
+ITEM_COLS = [*store.COMPACT_COLS, "baru"]
+
+_pipe: pipeline.Pipeline | None = None
+_lock = threading.Lock()
+
+def current() -> pipeline.Pipeline:
+    # Satu Pipeline hangat per proses; dibangun ulang hanya jika katalog berubah (scraper/ingest)
+    global _pipe
+    head = store.read_head() or {"latest": None, "current": {}}
+    with _lock:
+        if _pipe is None or pipeline.catalog_key(_pipe.head) != pipeline.catalog_key(head):
+            _pipe = pipeline.Pipeline(head)
+        return _pipe
+
+def int_param(params, name: str, default: int, lo: int = 1, hi: int | None = None) -> int:
+    try:
+        value = int(params.get(name, default))
+    except ValueError:
+        raise ValueError(f"parameter {name} harus bilangan bulat")
+    if value < lo or (hi is not None and value > hi):
+        raise ValueError(f"parameter {name} di luar rentang {lo}..{hi or ''}")
+    return value
+
+def text_param(params, name: str) -> str:
+    return params.get(name, "").strip().lower()
+
+def facet_param(pipe: pipeline.Pipeline, params, name: str) -> list:
+    values = params.getlist(name)
+    index = pipe.facets[name]
+    unknown = [v for v in values if v not in index.lookup]
+    if unknown:
+        # Sarankan opsi yang memuat nilai tersebut ("Bandung" -> "Kota Bandung", ...), selain itu contoh opsi
+        needle = unknown[0].strip().lower()
+        close = [o for o, low in zip(index.options, (o.lower() for o in index.options)) if needle and needle in low]
+        shown = (close or index.options)[:SUGGEST_MAX]
+        more = len(close or index.options) - len(shown)
+        raise ValueError(
+            f"nilai {name} tidak dikenal: {', '.join(unknown)}; pilihan yang valid: {', '.join(shown)}"
+            + (f" (+{more} lainnya, lihat /facets)" if more > 0 else "")
+        )
+    return values
+
+def filter_rows(pipe: pipeline.Pipeline, params, global_search: bool = True) -> np.ndarray:
+    mask = pipe.filter_mask(
+        {name: facet_param(pipe, params, name) for name in FACETS},
+        params.get("baru") in ("1", "true"),
+        text_param(params, "keyword"),
+        text_param(params, "q") if global_search else "",
+        params.get("substring") in ("1", "true"),
+    )
+    return np.flatnonzero(mask)
+
+def items(pipe: pipeline.Pipeline, rows: np.ndarray) -> list:
+    part = pipe.df.iloc[rows][ITEM_COLS]
+    records = part.astype(object).where(part.notna(), None).to_dict("records")
+    prov, kota = pipe.lists["provinsi"].lists(rows), pipe.lists["kota"].lists(rows)
+    for rec, row, link, p, k in zip(records, rows, pipeline.links(part["slug"]), prov, kota):
+        rec.update(row=int(row), link=link, lokasi={"provinsi": p, "kota": k})
+    return records
+
+def page_of(pipe: pipeline.Pipeline, rows: np.ndarray, params) -> dict:
+    per_page = int_param(params, "per_page", PER_PAGE, hi=MAX_PER_PAGE)
+    pages = max(1, -(-len(rows) // per_page))
+    page = int_param(params, "page", 1, hi=pages)
+    return {
+        "snapshot": pipe.snapshot,
+        "total": len(rows),
+        "page": page,
+        "per_page": per_page,
+        "pages": pages,
+        "items": items(pipe, rows[(page - 1) * per_page:page * per_page]),
+    }
+
+def lowongan(pipe: pipeline.Pipeline, params) -> dict:
+    return page_of(pipe, filter_rows(pipe, params), params)
+
+def cari(pipe: pipeline.Pipeline, params) -> dict:
+    if not text_param(params, "q"):
+        raise ValueError("parameter q wajib diisi")
+    return lowongan(pipe, params)
+
+def facet_counts(pipe: pipeline.Pipeline, params) -> dict:
+    # Hitungan & total kuota per nilai facet untuk hasil filter, langsung dari cube (sama dengan tab Insights);
+    # by=jumlah mengurutkan menurut kuota
+    top = int_param(params, "top", FACET_TOP, hi=1000)
+    by = params.get("by", "count")
+    if by not in ("count", "jumlah"):
+        raise ValueError("parameter by harus count atau jumlah")
+    mask = np.zeros(len(pipe.df), dtype=bool)
+    mask[filter_rows(pipe, params)] = True
+    return {
+        "snapshot": pipe.snapshot,
+        "total": int(mask.sum()),
+        "jumlah": cubes.total_sum(pipe.df["jumlah"].to_numpy(), mask),
+        "facets": {
+            name: cube.summary(mask, top, by).to_dict("records")
+            for name, cube in pipe.cubes.items()
+        },
+    }
+
+def rekomendasi(pipe: pipeline.Pipeline, params) -> dict:
+    # q = posisi yang dicari (BM25 lokal); expand = kata kunci tambahan dipisah koma (rerank, opsional)
+    posisi = params.get("q", "").strip()
+    if not posisi:
+        raise ValueError("parameter q wajib diisi")
+    k = int_param(params, "k", recommend.TOP_K, hi=MAX_PER_PAGE)
+    expand = [t.strip() for t in params.get("expand", "").split(",") if t.strip()]
+    top = recommend.rank(pipe.recommender, posisi, filter_rows(pipe, params, global_search=False), expand, k)
+    scores = pipe.recommender.scores(recommend.query_tokens(posisi))[top]
+    out = items(pipe, top)
+    for rec, score in zip(out, scores):
+        rec["skor"] = round(float(score), 4)
+    return {"snapshot": pipe.snapshot, "total": len(out), "items": out}
+
+def etag_for(pipe: pipeline.Pipeline, request: Request) -> str:
+    # Per versi katalog + query (urutan parameter tidak berpengaruh)
+    query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+    return '"' + hashlib.sha1(f"{pipeline.catalog_key(pipe.head)}|{request.url.path}?{query}".encode()).hexdigest() + '"'
+
+async def respond(request: Request, build: Callable[[pipeline.Pipeline, object], dict]) -> Response:
+    # Kerja numpy/pandas di threadpool agar event loop tetap melayani request lain
+    pipe = await run_in_threadpool(current)
+    etag = etag_for(pipe, request)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in [t.strip() for t in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+    try:
+        body = await run_in_threadpool(build, pipe, request.query_params)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    return JSONResponse(body, headers=headers)
+
+async def lowongan_endpoint(request: Request) -> Response:
+    return await respond(request, lowongan)
+
+async def search_endpoint(request: Request) -> Response:
+    return await respond(request, cari)
+
+async def facets_endpoint(request: Request) -> Response:
+    return await respond(request, facet_counts)
+
+async def recommend_endpoint(request: Request) -> Response:
+    return await respond(request, rekomendasi)
+
+async def health_endpoint(request: Request) -> Response:
+    pipe = await run_in_threadpool(current)
+    return JSONResponse({"snapshot": pipe.snapshot, "rows": len(pipe.df), "dataset_mb": round(pipe.memory_mb, 2)})
+
+app = Starlette(routes=[
+    Route("/health", health_endpoint),
+    Route("/lowongan", lowongan_endpoint),
+    Route("/search", search_endpoint),
+    Route("/facets", facets_endpoint),
+    Route("/recommend", recommend_endpoint),
+])
+
+if __name__ == "__main__":
+    import uvicorn
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--ingest", action="store_true", help="jalankan ingest snapshot sebelum melayani")
+    args = parser.parse_args()
+    if args.ingest:
+        store.ingest()
+    current()
+    uvicorn.run(app, host=args.host, port=args.port)
@@ -0,0 +1,202 @@
+import argparse, json, pathlib, random, tempfile, time
+import numpy as np
+import pandas as pd
+from myapp import cubes, facets, gazetteer, lokasi, recommend, search, store, tab_data
+
+# --- Pendekatan lama (apply per baris + key_token) sebagai pembanding ---
+def legacy_lokasi(df: pd.DataFrame) -> pd.DataFrame:
+    def extract_lokasi(text, level):
+        if pd.isna(text):
+            return ""
+        for line in text.split("\n"):
+            if line.lower().startswith(level.lower()):
+                return line.split(":", 1)[-1].strip()
+        return ""
+
+    out = pd.DataFrame(index=df.index)
+    for col, lvl in [("provinsi", "Provinsi"), ("kota", "Kota")]:
+        out[col] = df["lokasi_penempatan"].apply(
+            lambda x: extract_lokasi(x, lvl) or extract_lokasi(x, "Kabupaten") if col == "kota" else extract_lokasi(x, lvl)
+        )
+        out[f"{col}_list"] = out[col].str.split(r",\s*").apply(
+            lambda lst: [s for s in lst if s and not s.isdigit()] if isinstance(lst, list) else []
+        )
+    for lst_col in ["provinsi_list", "kota_list"]:
+        mapping = {loc: lokasi.key_token(loc) or loc for sub in out[lst_col] for loc in sub}
+        out[lst_col] = out[lst_col].apply(lambda lst: [mapping.get(x, x) for x in lst])
+    return out
+
+def synthetic_lokasi(base: pd.Series, n: int, seed: int = 0) -> pd.Series:
+    # Campuran teks asli + teks template acak dari wilayah_id.txt
+    rng = random.Random(seed)
+    prov, kotakab = gazetteer.read_wilayah()
+    real = base.dropna().tolist()
+    rows = []
+    for _ in range(n):
+        if rng.random() < 0.5:
+            rows.append(rng.choice(real))
+        else:
+            rows.append(
+                f"Provinsi : {rng.choice(prov).title()}\n"
+                f"Kabupaten/Kota : {rng.choice(kotakab).title()}\n"
+                f"Kecamatan : Kec{rng.randrange(1000)}"
+            )
+    return pd.Series(rows, name="lokasi_penempatan")
+
+def timed(fn, *args, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def bench_lokasi(rows: list[int]) -> list[dict]:
+    snap = store.read_snapshot(sorted(pathlib.Path("data_lowongan").glob("*.json"))[-1])
+    gaz = gazetteer.build()
+    results = []
+    for n in rows:
+        df = snap[["lokasi_penempatan"]] if n == 0 else synthetic_lokasi(snap["lokasi_penempatan"], n).to_frame()
+        tbl = lokasi.normalise(df.copy(), gaz)
+        results.append({
+            "stage": "lokasi",
+            "rows": len(df),
+            "legacy_s": timed(legacy_lokasi, df),
+            "key_token_s": timed(lambda d: lokasi.normalise(d.copy()), df),
+            "gazetteer_s": timed(lambda d: lokasi.normalise(d.copy(), gaz), df),
+            "gazetteer_rows_with_prov": int(tbl.loc[(tbl["level"] == "provinsi") & (tbl["loc_id"] >= 0), "row"].nunique()),
+        })
+    return results
+
+def template_snapshot() -> dict:
+    with open(sorted(pathlib.Path("data_lowongan").glob("*.json"))[-1], "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def synthetic_snapshot(n: int, seed: int = 0, template: dict | None = None) -> dict:
+    # Snapshot format Inertia (props.data.data) berisi n baris: baris asli diacak, id/slug unik,
+    # mitra & lokasi sebagian sintetis agar kardinalitas ikut tumbuh dengan n
+    page = template or template_snapshot()
+    real = page["props"]["data"]["data"]
+    rng = np.random.default_rng(seed)
+    base = rng.integers(len(real), size=n)
+    extra_desc = rng.integers(len(real), size=n)
+    lok = synthetic_lokasi(pd.Series([r["lokasi_penempatan"] for r in real]), n, seed)
+    n_mitra = max(len({r["mitra"] for r in real}), n // 20)
+    rows = []
+    for i in range(n):
+        row = dict(real[base[i]])
+        row.update(
+            id_lowongan=i + 1,
+            slug=f"lowongan-{i + 1}",
+            jumlah=int(rng.integers(1, 11)),
+            lokasi_penempatan=lok.iat[i],
+            deskripsi=f"{row['deskripsi']}\n{real[extra_desc[i]]['deskripsi'].splitlines()[0]}",
+        )
+        if rng.random() < 0.3:
+            k = int(rng.integers(n_mitra))
+            row.update(mitra=f"PT Sintetis {k}", mitra_slug=f"sintetis-{k}", id_mitra=100_000 + k)
+        rows.append(row)
+    out = json.loads(json.dumps({k: v for k, v in page.items() if k != "props"}))
+    out["props"] = {**page["props"], "data": {**page["props"]["data"], "data": rows, "total": n, "per_page": n}}
+    return out
+
+def timed_once(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return time.perf_counter() - t0, out
+
+def bench_pipeline(rows: list[int], repeat: int = 3, work_dir: pathlib.Path | None = None) -> list[dict]:
+    # Tiap tahap dashboard di luar Streamlit: ingest -> load -> index -> filter/search -> agregasi -> render
+    template = template_snapshot()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        root = work_dir or pathlib.Path(tmp)
+        for n in rows:
+            folder, store_dir = root / f"bench_{n}" / "data_lowongan", root / f"bench_{n}" / "data_store"
+            folder.mkdir(parents=True, exist_ok=True)
+            out = lambda stage, seconds, **kw: results.append(
+                {"suite": "pipeline", "stage": stage, "rows": n, "seconds": round(seconds, 6), **kw}
+            )
+
+            t, snap = timed_once(synthetic_snapshot, n, 0, template)
+            out("generate", t)
+            path = folder / "data-01-01-2030.json"
+            t, _ = timed_once(lambda: path.write_text(json.dumps(snap, ensure_ascii=False), encoding="utf-8"))
+            out("write_json", t, mb=round(path.stat().st_size / 2**20, 2))
+            del snap
+
+            t, _ = timed_once(store.ingest, [folder.as_posix()], store_dir)
+            out("ingest_cold", t)
+            t, _ = timed_once(store.ingest, [folder.as_posix()], store_dir)
+            out("ingest_noop", t)
+            load = lambda: store.load_current(folder.as_posix(), store_dir)
+            out("load_current", timed(load, repeat=repeat))
+            full = load()
+            load = lambda: store.load_compact(folder.as_posix(), store_dir)
+            out("load_compact", timed(load, repeat=repeat))
+            df, lists = load()
+            # Memori dataset: semua kolom + list Python vs kolom dashboard + ListColumn
+            out("memory_full", 0.0, mb=round(full.memory_usage(deep=True).sum() / 2**20, 2))
+            out("memory_compact", 0.0, mb=round(
+                (df.memory_usage(deep=True).sum() + sum(c.nbytes() for c in lists.values())) / 2**20, 2
+            ))
+
+            t, search_idx = timed_once(search.build_indexes, df)
+            out("index_search", t)
+            t, facet_idx = timed_once(facets.build_facets, df, lists)
+            out("index_facets", t)
+            t, rec = timed_once(recommend.Recommender.build, df)
+            out("index_bm25", t)
+            t, cube_idx = timed_once(cubes.build_cubes, df, lists)
+            out("index_cubes", t)
+
+            sel = {
+                "posisi": [df["posisi_magang"].astype(object).mode().iat[0]],
+                "provinsi": [facet_idx["provinsi"].options[0]],
+                "kota": [],
+                "mitra": [],
+            }
+            out("filter_facets", timed(facets.resolve, facet_idx, sel, len(df), repeat=repeat))
+            mask = facets.resolve(facet_idx, {"provinsi": sel["provinsi"]}, len(df))
+            out("search_index", timed(lambda: search_idx["semua"].search("data analyst"), repeat=repeat))
+            out("search_substring", timed(search.substring_mask, df, "data analyst", search.SEARCH_FIELDS, repeat=repeat))
+            out("recommend_topk", timed(lambda: rec.top_k(rec.scores(recommend.query_tokens("data analyst"))), repeat=repeat))
+
+            out("viz_cubes", timed(lambda: [c.top(mask) for c in cube_idx.values()], repeat=repeat), selected=int(mask.sum()))
+            filtered = full[mask]
+            # Per sesi: salinan hasil filter (cara lama) vs posisi baris
+            out("session_filter_copy", timed(lambda: full[mask], repeat=repeat),
+                mb=round(filtered.memory_usage(deep=True).sum() / 2**20, 2))
+            rows = np.flatnonzero(mask)
+            out("session_filter_rows", timed(np.flatnonzero, mask, repeat=repeat), mb=round(rows.nbytes / 2**20, 4))
+            out("viz_value_counts", timed(lambda: [
+                filtered["provinsi_list"].explode().value_counts().head(10),
+                filtered["kota_list"].explode().value_counts().head(10),
+                filtered["posisi_magang"].value_counts().head(10),
+                filtered["mitra"].value_counts().head(10),
+            ], repeat=repeat))
+
+            render = tab_data.render_page.__wrapped__
+            out("render_page", timed(lambda: render(tab_data.filter_signature(df, rows), 1, df.iloc[rows[:tab_data.ITEMS_PP]]),
+                                     repeat=repeat))
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--suite", choices=["pipeline", "lokasi", "all"], default="pipeline")
+    parser.add_argument("--rows", type=int, nargs="*", help="pipeline: 1000 10000 100000; lokasi: 0 = snapshot asli")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--work-dir", type=pathlib.Path, help="simpan snapshot & store sintetis di sini (default: temp)")
+    parser.add_argument("--out", type=pathlib.Path, help="tambahkan hasil JSONL ke file ini")
+    args = parser.parse_args()
+
+    results = []
+    if args.suite in ("pipeline", "all"):
+        results += bench_pipeline(args.rows or [1_000, 10_000, 100_000], args.repeat, args.work_dir)
+    if args.suite in ("lokasi", "all"):
+        results += bench_lokasi(args.rows or [0, 100_000])
+    for res in results:
+        print(json.dumps(res))
+    if args.out:
+        with open(args.out, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(res) + "\n" for res in results)
@@ -1,8 +1,8 @@
-import json, pathlib, re, requests
-from typing import List
+import uuid
+import numpy as np
 import pandas as pd
 import streamlit as st
-from myapp import tab_cv, tab_data, tab_viz, tab_intern
+from myapp import cubes, pipeline, profiling, store, tab_cv, tab_data, tab_trend, tab_viz, tab_intern
 
 st.set_page_config(
     page_title="Dashboard Lowongan Magang MBKM",
@@ -11,83 +11,30 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
-API_BASE = "https://raw.githubusercontent.com/cahyadsn/api-wilayah-indonesia/master"
-LOWONGAN_PATH = "lowongan.json"
-WL_PATH = pathlib.Path("wilayah_id.txt")
-
-@st.cache_data(show_spinner=False)
-def fetch_whitelist(path: pathlib.Path = WL_PATH) -> set[str]:
-    if path.exists():
-        lines = path.read_text("utf-8").splitlines()
-    else:
-        prov = requests.get(f"{API_BASE}/provinces.json", timeout=30).json()
-        regs = [r for p in prov for r in requests.get(f"{API_BASE}/regencies/{p['id']}.json", timeout=30).json()]
-        lines = (
-            ["# Provinsi"]
-            + [p["name"] for p in prov]
-            + ["", "# KotaKab"]
-            + [r["name"] for r in regs]
-        )
-        path.write_text("\n".join(lines), encoding="utf-8")
-    return {l.strip() for l in lines if l.strip() and not l.startswith("#")}
-
-@st.cache_data(show_spinner=False)
-def load_lowongan(folder: str = "data_lowongan") -> pd.DataFrame:
-    dfs = []
-    folder_path = pathlib.Path(folder)
-    for file in folder_path.glob("*.json"):
-        with open(file, "r", encoding="utf-8") as f:
-            raw = json.load(f)
-        if "props" in raw and "data" in raw["props"] and "data" in raw["props"]["data"]:
-            dfs.append(pd.DataFrame(raw["props"]["data"]["data"]))
-    if dfs:
-        return pd.concat(dfs, ignore_index=True)
-    return pd.DataFrame()
-
-df = load_lowongan()
-
-STOPWORDS = {"pusat", "timur", "barat", "utara", "selatan"}
-def extract_lokasi(text: str, level: str) -> str:
-    if pd.isna(text):
-        return ""
-    for line in text.split("\n"):
-        if line.lower().startswith(level.lower()):
-            return line.split(":", 1)[-1].strip()
-    return ""
-
-def clean_tokens(name: str) -> List[str]:
-    name = re.sub(
-        r"(provinsi|kabupaten|kota|daerah(?:\s+khusus|\s+istimewa)?|dki|kab\.|kota\.|prov\.)",
-        "",
-        name,
-        flags=re.I,
-    )
-    name = re.sub(r"[^a-z\s]", "", name.lower()).strip()
-    return [t for t in name.split() if t and t not in STOPWORDS]
-
-def key_token(name: str) -> str | None:
-    toks = clean_tokens(name)
-    return toks[-1].title() if toks else None
-
-for col, lvl in [("provinsi", "Provinsi"), ("kota", "Kota")]:
-    df[col] = df["lokasi_penempatan"].apply(
-        lambda x: extract_lokasi(x, lvl)
-        or extract_lokasi(x, "Kabupaten")
-        if col == "kota"
-        else extract_lokasi(x, lvl)
-    )
-    df[f"{col}_list"] = df[col].str.split(r",\s*").apply(
-        lambda lst: [s for s in lst if s and not s.isdigit()] if isinstance(lst, list) else []
-    )
-
-prov_map = {loc: key_token(loc) or loc for sub in df["provinsi_list"] for loc in sub}
-kota_map = {loc: key_token(loc) or loc for sub in df["kota_list"] for loc in sub}
-for lst_col, mapping in [("provinsi_list", prov_map), ("kota_list", kota_map)]:
-    df[lst_col] = df[lst_col].apply(lambda lst: [mapping.get(x, x) for x in lst])
-
-df["Link"] = df["slug"].apply(lambda s: f"https://simbelmawa.kemdikbud.go.id/magang/lowongan/{s}")
-
-with st.sidebar:
+@st.cache_resource(show_spinner=False)
+def sync_store() -> None:
+    # Ingest sekali per proses; scraper memperbarui katalog setelahnya
+    store.ingest()
+
+@st.cache_resource(show_spinner="Menyiapkan data…", max_entries=2)
+def load_pipeline(catalog: str, _head: dict) -> pipeline.Pipeline:
+    # Satu objek per versi katalog untuk semua sesi; rerun tidak membangun ulang apa pun
+    profiling.count("pipeline_miss")
+    return pipeline.Pipeline(_head)
+
+# Profil per rerun: MBKM_DEBUG=1 (semua sesi) atau ?debug=1 (sesi ini saja)
+debug = profiling.enabled_by_env() or st.query_params.get("debug") == "1"
+profiling.start(debug, st.session_state.setdefault("profile_session", uuid.uuid4().hex[:8]) if debug else "")
+
+with profiling.stage("sync_store"):
+    sync_store()
+with profiling.stage("pipeline"):
+    head = store.read_head() or {"latest": None, "current": {}}
+    pipe = load_pipeline(pipeline.catalog_key(head), head)
+    df = pipe.df
+facet_idx, rec_idx, cube_idx = pipe.facets, pipe.recommender, pipe.cubes
+
+with profiling.stage("sidebar"), st.sidebar:
     st.title("⚙️ Pengaturan")
 
     api_key = st.text_input("🔑 OpenRouter API Key (For AI)", type="password")
@@ -112,64 +59,74 @@ with st.sidebar:
     st.divider()
     st.header("🛠️ Filter Lowongan")
 
-    posisi_opt = sorted(df["posisi_magang"].dropna().unique())
-    prov_opt   = sorted({p for sub in df["provinsi_list"] for p in sub})
-    kota_opt   = sorted({k for sub in df["kota_list"] for k in sub})
+    posisi_opt = facet_idx["posisi"].options
+    prov_opt   = facet_idx["provinsi"].options
+    kota_opt   = facet_idx["kota"].options
+    mitra_opt  = facet_idx["mitra"].options
 
     pilih_posisi = st.multiselect("Posisi", posisi_opt)
     pilih_prov   = st.multiselect("Provinsi", prov_opt)
     pilih_kota   = st.multiselect("Kota/Kabupaten", kota_opt)
+    pilih_mitra  = st.multiselect("Mitra", mitra_opt)
+    hanya_baru   = st.checkbox(f"🆕 Hanya lowongan baru sejak snapshot terakhir ({int(df['baru'].sum())})")
     keyword      = st.text_input("Cari deskripsi (keyword bebas)", placeholder="mis. data, marketing ...").strip().lower()
 
     st.divider()
     st.header("🔎 Global Search")
     global_query = st.text_input("Cari cepat (posisi/mitra/deskripsi/lokasi)", placeholder="Full-text search ...").strip().lower()
+    mode_substring = st.toggle("Mode substring (lebih lambat, cocokkan potongan kata)", value=False)
 
-def contains_any(selected: List[str], target: List[str]) -> bool:
-    return any(sel.lower() in tgt.lower() for sel in selected for tgt in target)
-
-def apply_filter(_df: pd.DataFrame) -> pd.DataFrame:
-    tmp = _df.copy()
-    if pilih_posisi:
-        tmp = tmp[tmp["posisi_magang"].str.contains("|".join(map(re.escape, pilih_posisi)), case=False, na=False)]
-    if pilih_prov:
-        tmp = tmp[tmp["provinsi_list"].apply(lambda lst: contains_any(pilih_prov, lst))]
-    if pilih_kota:
-        tmp = tmp[tmp["kota_list"].apply(lambda lst: contains_any(pilih_kota, lst))]
-    if keyword:
-        tmp = tmp[tmp["deskripsi"].str.contains(keyword, case=False, na=False)]
-    if global_query:
-        mask = (
-            tmp["deskripsi"].str.contains(global_query, case=False, na=False)
-            | tmp["posisi_magang"].str.contains(global_query, case=False, na=False)
-            | tmp["mitra"].str.contains(global_query, case=False, na=False)
-            | tmp["provinsi"].str.contains(global_query, case=False, na=False)
-            | tmp["kota"].str.contains(global_query, case=False, na=False)
-        )
-        tmp = tmp[mask]
-    return tmp
+with profiling.stage("filter"):
+    # Posisi baris saja; tab mengambil baris yang ditampilkan dari dataset bersama
+    mask = pipe.filter_mask(
+        {"posisi": pilih_posisi, "provinsi": pilih_prov, "kota": pilih_kota, "mitra": pilih_mitra},
+        hanya_baru, keyword, global_query, mode_substring,
+    )
+    rows = np.flatnonzero(mask)
 
-filtered = apply_filter(df)
+with profiling.stage("metrics"):
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Total Lowongan", len(df))
+    col2.metric("Hasil Filter", len(rows))
+    col3.metric("Total Divisi", cubes.total_sum(df["jumlah"].to_numpy(), mask))
+    col4.metric("Mitra Unik", cube_idx["mitra"].nunique(mask))
 
-col1, col2, col3, col4 = st.columns(4)
-col1.metric("Total Lowongan", len(df))
-col2.metric("Hasil Filter", len(filtered))
-col3.metric("Total Divisi", int(filtered["jumlah"].sum()))
-col4.metric("Mitra Unik", filtered["mitra"].nunique())
+data_tab, viz_tab, trend_tab, cv_tab, intern_recom = st.tabs(
+    ["📄 Data", "📈 Insights", "📉 Tren", "📝 CV Analyzer", "📊 Recomendations"]
+)
 
-data_tab, viz_tab, cv_tab, intern_recom = st.tabs(["📄 Data", "📈 Insights", "📝 CV Analyzer", "📊 Recomendations"])
+with data_tab, profiling.stage("tab_data"):
+    tab_data.show(df, rows, pipe.head["latest"])
 
-with data_tab:
-    tab_data.show(filtered)
+with viz_tab, profiling.stage("tab_viz"):
+    tab_viz.show(cube_idx, mask)
 
-with viz_tab:
-    tab_viz.show(filtered)
+with trend_tab, profiling.stage("tab_trend"):
+    tab_trend.show(pipe.trends)
 
-with cv_tab:
-    tab_cv.show(filtered, api_key)
+with cv_tab, profiling.stage("tab_cv"):
+    tab_cv.show(df, rows, api_key, rec_idx)
 
-with intern_recom:
-    tab_intern.show(filtered, api_key)
+with intern_recom, profiling.stage("tab_intern"):
+    tab_intern.show(df, rows, api_key, rec_idx)
 
 
 st.caption("© 2025 Dashboard Lowongan Magang Berdampak (MBER)")
+
+if debug:
+    # Dataset dibagi semua sesi; per sesi hanya mask + posisi baris hasil filter
+    session_kb = (mask.nbytes + rows.nbytes) / 1024
+    record = profiling.finish({
+        "rows": len(df), "filtered": len(rows), "dataset_mb": round(pipe.memory_mb, 2), "session_kb": round(session_kb, 1),
+    })
+    with st.sidebar.expander("🐞 Profil rerun ini", expanded=True):
+        st.caption(
+            f"Total {record['total_s'] * 1000:.1f} ms · RSS {record['rss_mb'] if record['rss_mb'] is not None else '?'} MB · "
+            f"dataset {pipe.memory_mb:.1f} MB (bersama) · sesi {session_kb:.1f} KB"
+        )
+        st.dataframe(
+            pd.Series(record["stages"], name="ms").mul(1000).round(2).sort_values(ascending=False),
+            width="stretch",
+        )
+        st.json({"counts": record["counts"], "llm": record["llm"]}, expanded=False)
+        st.caption(f"Log: `{profiling.LOG_PATH}`")
@@ -0,0 +1,92 @@
+from typing import Dict
+import numpy as np
+import pandas as pd
+from myapp import lokasi
+
+class Cube:
+    # Satu dimensi: pasangan (row, code) + label; hitungan & jumlah (kuota) penuh disiapkan sekali per snapshot.
+    # ordered=True (kolom kategori): seri diurutkan menurut urutan kategori, seperti value_counts()
+    def __init__(self, rows: np.ndarray, codes: np.ndarray, labels, n_rows: int, ordered: bool = False,
+                 weights: np.ndarray | None = None):
+        keep = codes >= 0
+        self.n_rows = n_rows
+        self.ordered = ordered
+        self.rows = rows[keep].astype("int32")
+        self.codes = codes[keep].astype("int32")
+        self.labels = np.asarray(labels, dtype=object)
+        self.total = np.bincount(self.codes, minlength=len(self.labels))
+        self.first = self.first_seen(self.codes, np.arange(len(self.codes)))
+        # Bobot per pasangan (jumlah baris); baris dengan beberapa nilai ikut dijumlahkan di tiap nilai, seperti explode()
+        weights = np.zeros(n_rows, dtype="int64") if weights is None else np.asarray(weights, dtype="int64")
+        self.weights = weights[self.rows]
+        self.total_sum = np.bincount(self.codes, weights=self.weights, minlength=len(self.labels)).astype("int64")
+
+    def first_seen(self, codes: np.ndarray, pos: np.ndarray) -> np.ndarray:
+        # Posisi pasangan pertama per nilai (urutan baris, lalu urutan di dalam list)
+        if self.ordered:
+            return np.arange(len(self.labels))
+        first = np.full(len(self.labels), len(self.codes), dtype="int64")
+        np.minimum.at(first, codes, pos)
+        return first
+
+    def counts(self, mask: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+        # (hitungan, kemunculan pertama) per nilai; tanpa filter langsung dari cube
+        if mask is None or mask.all():
+            return self.total, self.first
+        hit = np.flatnonzero(mask[self.rows])
+        codes = self.codes[hit]
+        return np.bincount(codes, minlength=len(self.labels)), self.first_seen(codes, hit)
+
+    def sums(self, mask: np.ndarray | None = None) -> np.ndarray:
+        # Total jumlah (kuota divisi) per nilai untuk baris yang lolos filter
+        if mask is None or mask.all():
+            return self.total_sum
+        hit = np.flatnonzero(mask[self.rows])
+        return np.bincount(self.codes[hit], weights=self.weights[hit], minlength=len(self.labels)).astype("int64")
+
+    def summary(self, mask: np.ndarray | None = None, k: int = 10, by: str = "count") -> pd.DataFrame:
+        # Top-k nilai (value, count, jumlah); by="count" urut seperti value_counts(), by="jumlah" menurut kuota
+        counts, first = self.counts(mask)
+        sums = self.sums(mask)
+        key = counts if by == "count" else sums
+        ids = np.flatnonzero(counts)
+        ids = ids[np.lexsort((first[ids], -key[ids]))][:k]
+        return pd.DataFrame({"value": self.labels[ids], "count": counts[ids], "jumlah": sums[ids]})
+
+    def top(self, mask: np.ndarray | None = None, k: int = 10) -> pd.Series:
+        # Urutan sama dengan value_counts(): jumlah menurun, seri menurut kategori/kemunculan pertama
+        table = self.summary(mask, k)
+        return pd.Series(table["count"].to_numpy(), index=pd.Index(table["value"], dtype=object), name="count")
+
+    def nunique(self, mask: np.ndarray | None = None) -> int:
+        return int(np.count_nonzero(self.counts(mask)[0]))
+
+def single_cube(col: pd.Series, weights: np.ndarray | None = None) -> Cube:
+    rows = np.arange(len(col))
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        return Cube(rows, col.cat.codes.to_numpy(), col.cat.categories, len(col), ordered=True, weights=weights)
+    codes, uniques = pd.factorize(col.astype(object))
+    return Cube(rows, codes, uniques, len(col), weights=weights)
+
+def list_cube(col: lokasi.ListColumn, weights: np.ndarray | None = None) -> Cube:
+    # id sudah berurutan menurut kemunculan pertama, jadi langsung dipakai sebagai code
+    return Cube(col.rows(), col.ids, col.labels, len(col), weights=weights)
+
+def build_cubes(df: pd.DataFrame, lists: Dict[str, lokasi.ListColumn] | None = None) -> Dict[str, Cube]:
+    lists = lists or {k: lokasi.ListColumn.from_lists(df[f"{k}_list"]) for k in ("provinsi", "kota")}
+    jumlah = jumlah_values(df)
+    return {
+        "posisi": single_cube(df["posisi_magang"], jumlah),
+        "mitra": single_cube(df["mitra"], jumlah),
+        "provinsi": list_cube(lists["provinsi"], jumlah),
+        "kota": list_cube(lists["kota"], jumlah),
+    }
+
+def jumlah_values(df: pd.DataFrame) -> np.ndarray:
+    # Kuota kosong/tidak valid dihitung 0, seperti sum() pandas yang melewati NaN
+    if "jumlah" not in df:
+        return np.zeros(len(df), dtype="int64")
+    return pd.to_numeric(df["jumlah"], errors="coerce").fillna(0).to_numpy(dtype="int64")
+
+def total_sum(values: np.ndarray, mask: np.ndarray | None = None) -> int:
+    return int(np.nansum(values if mask is None else values[mask]))
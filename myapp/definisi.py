@@ -0,0 +1,104 @@
+import concurrent.futures as cf
+import functools, json, pathlib, threading, time
+from typing import Iterable
+from urllib.parse import quote
+import requests
+from myapp import search, store
+
+WIKI_API = "https://en.wikipedia.org/api/rest_v1/page/summary/"
+BUNDLED_PATH = pathlib.Path("definisi_posisi.json")
+CACHE_PATH = store.STORE_DIR / "definisi_cache.json"
+MISS_TTL = 7 * 24 * 3600
+TIMEOUT = 10
+MAX_WORKERS = 8
+
+_cache: dict = {}
+_cache_mtime = None
+_lock = threading.Lock()
+
+def title_key(posisi: str) -> str:
+    return " ".join(search.query_tokens(posisi))
+
+@functools.lru_cache(maxsize=1)
+def bundled(path: pathlib.Path = BUNDLED_PATH) -> dict:
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def bundled_lookup(key: str) -> str:
+    # Frasa terpanjang dari tabel offline yang muncul utuh di judul ("ui ux designer intern" -> "ui ux");
+    # frasa sama panjang: ambil yang paling kanan (kata inti jabatan biasanya di akhir)
+    table, toks = bundled(), key.split()
+    for n in range(len(toks), 0, -1):
+        for i in range(len(toks) - n, -1, -1):
+            text = table.get(" ".join(toks[i:i + n]))
+            if text:
+                return text
+    return ""
+
+def read_cache(path: pathlib.Path = CACHE_PATH) -> dict:
+    # Dibaca ulang hanya jika file berubah (prefetch dari proses lain)
+    global _cache, _cache_mtime
+    mtime = path.stat().st_mtime if path.exists() else None
+    with _lock:
+        if mtime != _cache_mtime:
+            _cache = json.loads(path.read_text("utf-8")) if mtime else {}
+            _cache_mtime = mtime
+        return _cache
+
+def lookup(posisi: str) -> str:
+    # Tanpa jaringan: tabel offline, lalu cache Wikipedia di disk
+    key = title_key(posisi)
+    table = bundled()
+    if key in table:
+        return table[key]
+    return (read_cache().get(key) or {}).get("text") or bundled_lookup(key)
+
+def wiki_summary(title: str, session: requests.Session | None = None) -> str | None:
+    # "" = halaman tidak ada; None = gagal jaringan (jangan dicatat sebagai miss)
+    try:
+        resp = (session or requests).get(
+            WIKI_API + quote(title.replace(" ", "_")),
+            timeout=TIMEOUT,
+            headers={"User-Agent": "mbkm-dashboard/1.0"},
+        )
+    except requests.RequestException:
+        return None
+    if resp.status_code == 200:
+        return resp.json().get("extract") or ""
+    return "" if resp.status_code == 404 else None
+
+def fetch(key: str, session: requests.Session) -> str | None:
+    # Judul lengkap dulu, lalu kata pertama (perilaku lama)
+    title = key.title()
+    text = wiki_summary(title, session)
+    if text == "" and " " in title:
+        text = wiki_summary(title.split()[0], session)
+    return text
+
+def prefetch(titles: Iterable[str], path: pathlib.Path = CACHE_PATH, workers: int = MAX_WORKERS) -> int:
+    # Isi cache untuk semua posisi yang belum ada di tabel offline / cache; miss dicoba lagi setelah MISS_TTL
+    cache, now = read_cache(path), time.time()
+    table = bundled()
+    keys = {title_key(t) for t in titles} - {""}
+    todo = [
+        k for k in keys
+        if k not in table and (k not in cache or (not cache[k]["text"] and now - cache[k]["fetched"] > MISS_TTL))
+    ]
+    if not todo:
+        return 0
+    fresh = {}
+    with requests.Session() as session, cf.ThreadPoolExecutor(max_workers=workers) as pool:
+        # Judul pertama diambil dulu sebagai uji koneksi; offline = berhenti tanpa menunggu sisanya
+        first = fetch(todo[0], session)
+        if first is None:
+            return 0
+        results = [first, *pool.map(lambda k: fetch(k, session), todo[1:])]
+        fresh = {key: {"text": text, "fetched": now} for key, text in zip(todo, results) if text is not None}
+    if fresh:
+        # Gabung dengan isi file saat ini (prefetch lain mungkin menulis selama fetch), bukan menimpa
+        with _lock:
+            on_disk = json.loads(path.read_text("utf-8")) if path.exists() else {}
+            store.write_json({**on_disk, **fresh}, path)
+    return len(fresh)
@@ -0,0 +1,60 @@
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+from myapp import lokasi
+
+class FacetIndex:
+    def __init__(self, rows: np.ndarray, values: pd.Series, n_rows: int, substring: bool = False):
+        # Satu bitmap (packed bits) per nilai facet; baris -> bit
+        codes, uniques = pd.factorize(values, sort=True)
+        keep = codes >= 0
+        self.n_rows = n_rows
+        self.options: List[str] = [str(u) for u in uniques]
+        self.lookup = {v: i for i, v in enumerate(self.options)}
+        bits = np.zeros((len(self.options), (n_rows + 7) // 8), dtype=np.uint8)
+        rows = rows[keep]
+        np.bitwise_or.at(bits, (codes[keep], rows >> 3), (128 >> (rows & 7)).astype(np.uint8))
+        self.bits = bits
+        # Semantik lama (substring, case-insensitive) diperluas saat query, bukan per opsi saat build
+        self.substring = substring
+        self.lower = [o.lower() for o in self.options] if substring else []
+
+    def ids(self, selected: List[str]) -> List[int]:
+        ids = [self.lookup[s] for s in selected if s in self.lookup]
+        if self.substring and ids:
+            needles = {self.lower[i] for i in ids}
+            ids = [j for j, v in enumerate(self.lower) if any(n in v for n in needles)]
+        return ids
+
+    def select(self, selected: List[str]) -> np.ndarray:
+        ids = self.ids(selected)
+        if not ids:
+            return np.zeros(self.bits.shape[1], dtype=np.uint8)
+        return np.bitwise_or.reduce(self.bits[ids], axis=0)
+
+def single_facet(col: pd.Series, substring: bool = False) -> FacetIndex:
+    return FacetIndex(np.arange(len(col)), col.astype(object), len(col), substring)
+
+def list_facet(col: lokasi.ListColumn, substring: bool = False) -> FacetIndex:
+    return FacetIndex(col.rows(), pd.Series(col.values(), dtype=object), len(col), substring)
+
+def build_facets(df: pd.DataFrame, lists: Dict[str, lokasi.ListColumn] | None = None) -> Dict[str, FacetIndex]:
+    # lists: kolom lokasi ringkas (store.load_compact); tanpa itu diambil dari kolom *_list
+    lists = lists or {k: lokasi.ListColumn.from_lists(df[f"{k}_list"]) for k in ("provinsi", "kota")}
+    return {
+        "posisi": single_facet(df["posisi_magang"], substring=True),
+        "mitra": single_facet(df["mitra"]),
+        "provinsi": list_facet(lists["provinsi"], substring=True),
+        "kota": list_facet(lists["kota"], substring=True),
+    }
+
+def resolve(index: Dict[str, FacetIndex], selections: Dict[str, List[str]], n_rows: int) -> np.ndarray:
+    # OR di dalam facet, AND antar facet, dikerjakan langsung pada bitmap
+    bits = None
+    for name, selected in selections.items():
+        if selected:
+            sel = index[name].select(selected)
+            bits = sel if bits is None else bits & sel
+    if bits is None:
+        return np.ones(n_rows, dtype=bool)
+    return np.unpackbits(bits, count=n_rows).astype(bool)
@@ -0,0 +1,100 @@
+import concurrent.futures as cf
+import json, os, pathlib
+from html.parser import HTMLParser
+from typing import Iterator
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+BASE_URL = "https://simbelmawa.kemdikbud.go.id/magang/lowongan"
+PER_PAGE = 100
+MAX_WORKERS = 4
+
+class AppPageParser(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.data_page = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if self.data_page is None and attrs.get("id") == "app" and "data-page" in attrs:
+            self.data_page = attrs["data-page"]
+
+def parse_page(resp: requests.Response) -> dict:
+    # Respons Inertia (JSON) atau HTML penuh dengan atribut data-page di #app
+    if resp.headers.get("X-Inertia") or "json" in resp.headers.get("Content-Type", ""):
+        return resp.json()
+    parser = AppPageParser()
+    parser.feed(resp.text)
+    if parser.data_page is None:
+        raise RuntimeError("Elemen #app dengan data-page tidak ditemukan.")
+    return json.loads(parser.data_page)
+
+def make_session(workers: int = MAX_WORKERS) -> requests.Session:
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = "mbkm-dashboard/1.0"
+    return session
+
+def get_inertia(session: requests.Session, url: str, params: dict | None = None, version: str | None = None) -> dict:
+    headers = {"X-Inertia": "true", "X-Requested-With": "XMLHttpRequest"}
+    if version:
+        headers["X-Inertia-Version"] = version
+    r = session.get(url, params=params, headers=headers, timeout=30)
+    if r.status_code == 409:
+        # Versi aset berubah: server minta full reload, ambil HTML biasa
+        r = session.get(url, params=params, timeout=30)
+    r.raise_for_status()
+    return parse_page(r)
+
+def fetch_page(session: requests.Session, page: int, base_url: str = BASE_URL, per_page: int = PER_PAGE,
+               version: str | None = None) -> dict:
+    params = {"bidang": "", "cari": "", "page": page, "perPage": per_page}
+    return get_inertia(session, base_url, params, version)
+
+def iter_pages(base_url: str = BASE_URL, per_page: int = PER_PAGE, workers: int = MAX_WORKERS) -> Iterator[dict]:
+    # Halaman 1 menentukan last_page; sisanya diambil paralel (urutan tetap)
+    session = make_session(workers)
+    first = fetch_page(session, 1, base_url, per_page)
+    yield first
+    meta = first["props"]["data"]
+    version = first.get("version")
+    if meta.get("last_page"):
+        with cf.ThreadPoolExecutor(max_workers=workers) as pool:
+            yield from pool.map(
+                lambda p: fetch_page(session, p, base_url, per_page, version), range(2, meta["last_page"] + 1)
+            )
+        return
+    next_url = meta.get("next_page_url")
+    while next_url:
+        page = get_inertia(session, next_url, version=version)
+        yield page
+        next_url = page["props"]["data"].get("next_page_url")
+
+def write_snapshot(pages: Iterator[dict], path: pathlib.Path) -> int:
+    # Tulis tiap halaman langsung ke file snapshot (format Inertia yang sama)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    total = 0
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            for page in pages:
+                rows = page["props"]["data"]["data"]
+                if total == 0 and f.tell() == 0:
+                    page["props"]["data"]["data"] = "__ROWS__"
+                    prefix, suffix = json.dumps(page, ensure_ascii=False).split('"__ROWS__"', 1)
+                    f.write(prefix + "[")
+                for row in rows:
+                    f.write(("," if total else "") + json.dumps(row, ensure_ascii=False))
+                    total += 1
+            if f.tell() == 0:
+                raise RuntimeError("Tidak ada halaman yang berhasil diambil.")
+            f.write("]" + suffix)
+        os.replace(tmp, path)
+    finally:
+        # Crawl gagal di tengah: snapshot lama tetap utuh, file sementara tidak tertinggal
+        tmp.unlink(missing_ok=True)
+    return total
@@ -0,0 +1,133 @@
+import functools, pathlib, re
+from typing import List, Tuple
+import requests
+
+API_BASE = "https://raw.githubusercontent.com/cahyadsn/api-wilayah-indonesia/master"
+WL_PATH = pathlib.Path("wilayah_id.txt")
+
+END = "$"
+BARE = "~"
+RE_TOKEN = re.compile(r"[a-z0-9]+")
+# Teks bebas: nama kecamatan & jalan ("Kec. Batu Ampar", "Jl. Pagar Alam") dibuang sampai koma/akhir baris
+RE_NOISE = re.compile(r"\b(?:kec(?:amatan)?|jl|jln|jalan)\b\.?\s*:?\s*[^,\n]*", re.I)
+# Label field ("Kabupaten/Kota :") bukan bagian nama wilayah
+RE_LABEL = re.compile(r"^\s*(?:provinsi|kabupaten\s*/\s*kota|kota\s*/\s*kabupaten|kabupaten|kota)\s*:", re.I | re.M)
+
+# Alias tambahan di luar pola prefix Kab./Kota
+PROV_ALIASES = {
+    "DKI JAKARTA": ["jakarta", "daerah khusus jakarta", "daerah khusus ibukota jakarta"],
+    "DI YOGYAKARTA": ["diy", "yogyakarta", "daerah istimewa yogyakarta", "jogja"],
+}
+
+def fetch_wilayah(path: pathlib.Path = WL_PATH) -> List[str]:
+    if path.exists():
+        return path.read_text("utf-8").splitlines()
+    prov = requests.get(f"{API_BASE}/provinces.json", timeout=30).json()
+    regs = [r for p in prov for r in requests.get(f"{API_BASE}/regencies/{p['id']}.json", timeout=30).json()]
+    lines = (
+        ["# Provinsi"]
+        + [p["name"] for p in prov]
+        + ["", "# KotaKab"]
+        + [r["name"] for r in regs]
+    )
+    path.write_text("\n".join(lines), encoding="utf-8")
+    return lines
+
+def read_wilayah(path: pathlib.Path = WL_PATH) -> Tuple[List[str], List[str]]:
+    sections = {"provinsi": [], "kotakab": []}
+    current = None
+    for line in fetch_wilayah(path):
+        line = line.strip()
+        if line.startswith("#"):
+            current = "provinsi" if "provinsi" in line.lower() else "kotakab"
+        elif line and current:
+            sections[current].append(line)
+    return sections["provinsi"], sections["kotakab"]
+
+def tokens(text: str) -> List[str]:
+    return RE_TOKEN.findall(text.lower())
+
+def display_name(name: str) -> str:
+    return " ".join(w.upper() if w in {"Dki", "Di"} else w for w in name.title().split())
+
+class Gazetteer:
+    def __init__(self, provinsi: List[str], kotakab: List[str]):
+        self.trie: dict = {}
+        self.names: List[str] = []
+        self.levels: List[str] = []
+
+        for name in provinsi:
+            gid = self._entity("provinsi", name)
+            for alias in [name.lower()] + PROV_ALIASES.get(name, []):
+                self._insert(tokens(alias), gid)
+
+        # Kota didahulukan agar nama polos ("Bekasi") jatuh ke Kota, bukan Kabupaten
+        kotakab = sorted(kotakab, key=lambda n: not n.startswith("KOTA "))
+        for name in kotakab:
+            gid = self._entity("kota", name)
+            toks = tokens(name)
+            if toks[0] == "kota":
+                bare = toks[1:]
+                aliases = [toks, ["kota", "administrasi"] + bare, ["kota", "adm"] + bare]
+            else:
+                bare = toks[1:] if toks[0] == "kabupaten" else toks
+                aliases = [toks, ["kab"] + bare, ["kabupaten"] + bare]
+            for alias in aliases:
+                self._insert(alias, gid)
+            self._insert(bare, gid, bare=True)
+
+    def _entity(self, level: str, name: str) -> int:
+        self.names.append(display_name(name))
+        self.levels.append(level)
+        return len(self.names) - 1
+
+    def _insert(self, toks: List[str], gid: int, bare: bool = False) -> None:
+        node = self.trie
+        for t in toks:
+            node = node.setdefault(t, {})
+        ids = node.setdefault(END, [])
+        if bare and any(self.levels[i] == self.levels[gid] for i in ids):
+            return
+        if gid not in ids:
+            ids.append(gid)
+            if bare:
+                node.setdefault(BARE, set()).add(gid)
+        elif not bare:
+            node.get(BARE, set()).discard(gid)
+
+    def match(self, text: str, level: str | None = None) -> List[Tuple[int, str]]:
+        # Satu lintasan kiri-ke-kanan, ambil alias terpanjang di tiap posisi.
+        # level: teks adalah nilai field terstruktur (Provinsi / Kabupaten-Kota), hanya id level itu yang dipakai;
+        # tanpa level = teks bebas, nama polos kota hanya dipakai jika tidak ada kota yang disebut eksplisit
+        if not isinstance(text, str):
+            return []
+        toks = tokens(text if level else RE_NOISE.sub(" ", RE_LABEL.sub(" ", text)))
+        out, seen, i = [], set(), 0
+        while i < len(toks):
+            node, j, best = self.trie, i, None
+            while j < len(toks) and toks[j] in node:
+                node = node[toks[j]]
+                j += 1
+                ids = [g for g in node.get(END, ()) if level is None or self.levels[g] == level]
+                if ids:
+                    best = (j, ids, node.get(BARE, ()))
+            if best is None:
+                i += 1
+                continue
+            surface = " ".join(toks[i:best[0]])
+            # Nama polos yang sama dengan nama provinsi ("Bengkulu", "Jambi") = provinsi, bukan kota
+            is_prov = level is None and any(self.levels[g] == "provinsi" for g in best[1])
+            for gid in best[1]:
+                if is_prov and gid in best[2]:
+                    continue
+                if gid not in seen:
+                    seen.add(gid)
+                    out.append((gid, surface, gid in best[2]))
+            i = best[0]
+        if level is None and any(self.levels[g] == "kota" and not bare for g, _, bare in out):
+            out = [h for h in out if not h[2]]
+        return [(gid, surface) for gid, surface, _ in out]
+
+@functools.lru_cache(maxsize=None)
+def build(path: pathlib.Path = WL_PATH) -> Gazetteer:
+    return Gazetteer(*read_wilayah(path))
@@ -0,0 +1,130 @@
+import asyncio, hashlib, random, threading, time, uuid
+import concurrent.futures as cf
+from typing import Callable, Iterable, List
+from myapp import llm
+
+PER_KEY_LIMIT = 2
+MAX_WORKERS = 16
+MAX_ATTEMPTS = 4
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+KEEP_SECONDS = 3600
+FINISHED = {"done", "failed"}
+
+_queue = None
+_queue_lock = threading.Lock()
+
+def key_id(key: str) -> str:
+    # API key tidak pernah disimpan di rekaman job; cukup sidiknya untuk batas per key
+    return hashlib.sha256(key.encode()).hexdigest()[:12]
+
+def backoff(attempt: int, retry_after: float | None = None, base: float = BACKOFF_BASE, cap: float = BACKOFF_MAX) -> float:
+    # Eksponensial dengan jitter (separuh tetap, separuh acak); Retry-After dari server jadi batas bawah
+    delay = min(cap, base * 2 ** (attempt - 1))
+    return max(retry_after or 0.0, delay / 2 + random.uniform(0, delay / 2))
+
+class JobQueue:
+    # Event loop asyncio di thread daemon; panggilan LLM (requests, sinkron) jalan di executor.
+    # Satu objek per proses: sesi Streamlit hanya menyimpan id job lalu mem-poll statusnya
+    def __init__(self, per_key: int = PER_KEY_LIMIT, max_attempts: int = MAX_ATTEMPTS,
+                 backoff_base: float = BACKOFF_BASE, workers: int = MAX_WORKERS):
+        self.per_key = per_key
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.jobs: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._limits: dict[str, asyncio.Semaphore] = {}
+        self.loop = asyncio.new_event_loop()
+        self.loop.set_default_executor(cf.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-job"))
+        threading.Thread(target=self.loop.run_forever, name="llm-jobs", daemon=True).start()
+
+    def submit(self, fn: Callable[..., str], *args, key: str, label: str = "") -> str:
+        job_id = uuid.uuid4().hex[:12]
+        job = {
+            "id": job_id, "label": label, "key": key_id(key), "status": "queued", "attempts": 0,
+            "result": None, "error": None, "created": time.time(), "started": None, "finished": None,
+        }
+        with self._lock:
+            self.prune()
+            self.jobs[job_id] = job
+        asyncio.run_coroutine_threadsafe(self.run(job_id, fn, args), self.loop)
+        return job_id
+
+    def update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            self.jobs[job_id].update(fields)
+
+    async def run(self, job_id: str, fn: Callable[..., str], args: tuple) -> None:
+        # Semaphore per key dipegang juga selama backoff: key yang kena rate limit otomatis melambat
+        limit = self._limits.setdefault(self.jobs[job_id]["key"], asyncio.Semaphore(self.per_key))
+        async with limit:
+            for attempt in range(1, self.max_attempts + 1):
+                self.update(job_id, status="running", attempts=attempt, started=self.jobs[job_id]["started"] or time.time())
+                try:
+                    result = await asyncio.to_thread(fn, *args)
+                except Exception as e:
+                    if attempt < self.max_attempts and llm.retryable(e):
+                        delay = backoff(attempt, getattr(e, "retry_after", None), self.backoff_base)
+                        self.update(job_id, status="retrying", error=str(e), retry_in=round(delay, 2))
+                        await asyncio.sleep(delay)
+                        continue
+                    self.update(job_id, status="failed", error=str(e), finished=time.time())
+                    return
+                self.update(job_id, status="done", result=result, error=None, finished=time.time())
+                return
+
+    def status(self, ids: Iterable[str]) -> List[dict]:
+        # Salinan rekaman; id yang sudah dibuang (prune) dilaporkan sebagai gagal
+        with self._lock:
+            return [
+                dict(self.jobs[i]) if i in self.jobs else {"id": i, "status": "failed", "error": "job tidak ditemukan"}
+                for i in ids
+            ]
+
+    def wait(self, ids: List[str], timeout: float | None = None, poll: float = 0.1) -> List[dict]:
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            jobs = self.status(ids)
+            if all(j["status"] in FINISHED for j in jobs) or (deadline and time.time() > deadline):
+                return jobs
+            time.sleep(poll)
+
+    def prune(self, keep: float = KEEP_SECONDS) -> None:
+        now = time.time()
+        for job_id in [i for i, j in self.jobs.items() if j["finished"] and now - j["finished"] > keep]:
+            del self.jobs[job_id]
+
+def queue() -> JobQueue:
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+        return _queue
+
+def progress(jobs: List[dict]) -> tuple[int, int, int]:
+    # (selesai, gagal, sedang diulang)
+    count = lambda s: sum(j["status"] == s for j in jobs)
+    return count("done"), count("failed"), count("retrying")
+
+if __name__ == "__main__":
+    # Uji beban terhadap stub: python stub_server.py --key-limit 2 --fail-rate 0.2
+    #   OPENROUTER_BASE_URL=http://127.0.0.1:8765/api/v1 python -m myapp.jobs --n 12 --keys 2
+    import argparse, json
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=12)
+    parser.add_argument("--keys", type=int, default=2)
+    parser.add_argument("--per-key", type=int, default=PER_KEY_LIMIT)
+    args = parser.parse_args()
+    q = JobQueue(per_key=args.per_key)
+    t0 = time.perf_counter()
+    ids = [
+        q.submit(llm.chat, [{"role": "user", "content": f"job {i}"}], "stub/model", f"sk-test-{i % args.keys}", False,
+                 key=f"sk-test-{i % args.keys}", label=f"job {i}")
+        for i in range(args.n)
+    ]
+    jobs = q.wait(ids)
+    done, failed, _ = progress(jobs)
+    print(json.dumps({
+        "jobs": args.n, "done": done, "failed": failed, "seconds": round(time.perf_counter() - t0, 2),
+        "attempts": sum(j["attempts"] for j in jobs), "llm": llm.stats,
+    }))
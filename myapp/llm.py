@@ -0,0 +1,199 @@
+import hashlib, json, os, pathlib, sqlite3, threading, time
+from concurrent.futures import Future
+from contextlib import closing
+from typing import Iterator, List
+import requests
+from requests.adapters import HTTPAdapter
+
+API_BASE = os.environ.get("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+CACHE_PATH = pathlib.Path("data_store/llm_cache.sqlite")
+CACHE_TTL = 7 * 24 * 3600
+CACHE_MAX_BYTES = 50 * 1024 * 1024
+TIMEOUT = 90
+
+_session = None
+_session_lock = threading.Lock()
+_inflight: dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+stats = {"hit": 0, "miss": 0, "coalesced": 0}
+_stats_lock = threading.Lock()
+_tables: set[pathlib.Path] = set()
+_tables_lock = threading.Lock()
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+class LLMError(RuntimeError):
+    # Respons non-200 dari API; status & Retry-After dipakai antrean job untuk memutuskan retry
+    def __init__(self, detail, status: int | None = None, retry_after: float | None = None):
+        super().__init__(detail)
+        self.status = status
+        self.retry_after = retry_after
+
+def response_error(r: requests.Response) -> LLMError:
+    try:
+        detail = r.json()
+    except ValueError:
+        detail = r.text[:200]
+    try:
+        retry_after = float(r.headers.get("Retry-After", ""))
+    except ValueError:
+        retry_after = None
+    return LLMError(detail, r.status_code, retry_after)
+
+def retryable(exc: BaseException) -> bool:
+    # Rate limit / gangguan server / jaringan putus: layak dicoba lagi; error lain (key salah, dsb) tidak
+    if isinstance(exc, LLMError):
+        return exc.status in RETRY_STATUS
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout))
+
+def session() -> requests.Session:
+    # Satu Session (connection pool) untuk semua sesi Streamlit di proses ini
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=16)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+def cache_key(model: str, messages: List[dict], base: str | None = None) -> str:
+    # Endpoint ikut kunci: balasan stub lokal (OPENROUTER_BASE_URL) tidak pernah disajikan untuk API asli
+    payload = json.dumps({"base": base or API_BASE, "model": model, "messages": messages}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def count(name: str) -> None:
+    # Dipanggil dari banyak thread (sesi Streamlit, worker antrean job)
+    with _stats_lock:
+        stats[name] += 1
+
+def _db(path: pathlib.Path = CACHE_PATH) -> sqlite3.Connection:
+    # Koneksi pendek per operasi (pemanggil menutupnya lewat closing); tabel cukup dibuat sekali per file
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10)
+    with _tables_lock:
+        if path.resolve() not in _tables:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, model TEXT, created REAL, accessed REAL, size INTEGER, content TEXT)"
+            )
+            conn.commit()
+            _tables.add(path.resolve())
+    return conn
+
+def cache_get(key: str, ttl: float = CACHE_TTL, path: pathlib.Path = CACHE_PATH) -> str | None:
+    with closing(_db(path)) as conn, conn:
+        row = conn.execute("SELECT content, created FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if time.time() - row[1] > ttl:
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            return None
+        conn.execute("UPDATE cache SET accessed = ? WHERE key = ?", (time.time(), key))
+        return row[0]
+
+def cache_put(key: str, model: str, content: str, max_bytes: int = CACHE_MAX_BYTES, path: pathlib.Path = CACHE_PATH) -> None:
+    now, size = time.time(), len(content.encode())
+    with closing(_db(path)) as conn, conn:
+        conn.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, ?)", (key, model, now, now, size, content))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total > max_bytes:
+            # Buang entri yang paling lama tidak diakses sampai di bawah batas
+            for k, s in conn.execute("SELECT key, size FROM cache ORDER BY accessed").fetchall():
+                if total <= max_bytes:
+                    break
+                conn.execute("DELETE FROM cache WHERE key = ?", (k,))
+                total -= s
+
+def post_chat(messages: List[dict], model: str, key: str, timeout: float = TIMEOUT) -> str:
+    headers = {"Content-Type": "application/json", "Authorization": f"Bearer {key}"}
+    r = session().post(
+        f"{API_BASE}/chat/completions",
+        headers=headers,
+        json={"model": model, "messages": messages},
+        timeout=timeout,
+    )
+    if r.status_code != 200:
+        raise response_error(r)
+    return r.json()["choices"][0]["message"]["content"]
+
+def chat(messages: List[dict], model: str, key: str, use_cache: bool = True, ttl: float = CACHE_TTL) -> str:
+    ck = cache_key(model, messages)
+    if use_cache:
+        cached = cache_get(ck, ttl)
+        if cached is not None:
+            count("hit")
+            return cached
+
+    # Request identik yang sedang berjalan (sesi lain) cukup ditunggu hasilnya
+    with _inflight_lock:
+        fut = _inflight.get(ck)
+        owner = fut is None
+        if owner:
+            fut = _inflight[ck] = Future()
+    if not owner:
+        count("coalesced")
+        return fut.result()
+
+    count("miss")
+    try:
+        content = post_chat(messages, model, key)
+        if use_cache:
+            cache_put(ck, model, content)
+        fut.set_result(content)
+        return content
+    except Exception as e:
+        fut.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(ck, None)
+
+def stream_chat(messages: List[dict], model: str, key: str, timing: dict | None = None,
+                use_cache: bool = True, ttl: float = CACHE_TTL) -> Iterator[str]:
+    # Konsumsi SSE chat completion; generator ditutup (rerun Streamlit) = koneksi diputus
+    timing = {} if timing is None else timing
+    t0 = time.perf_counter()
+    ck = cache_key(model, messages)
+    if use_cache:
+        cached = cache_get(ck, ttl)
+        if cached is not None:
+            count("hit")
+            timing.update(cached=True, ttft=time.perf_counter() - t0, total=time.perf_counter() - t0)
+            yield cached
+            return
+
+    count("miss")
+    headers = {"Content-Type": "application/json", "Authorization": f"Bearer {key}"}
+    r = session().post(
+        f"{API_BASE}/chat/completions",
+        headers=headers,
+        json={"model": model, "messages": messages, "stream": True},
+        timeout=TIMEOUT,
+        stream=True,
+    )
+    try:
+        if r.status_code != 200:
+            raise response_error(r)
+        r.encoding = "utf-8"
+        parts = []
+        for line in r.iter_lines(decode_unicode=True):
+            # Baris komentar SSE (": OPENROUTER PROCESSING") & keep-alive dilewati
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            chunk = json.loads(data)
+            if "error" in chunk:
+                raise RuntimeError(chunk["error"])
+            delta = (chunk["choices"][0].get("delta") or {}).get("content")
+            if delta:
+                timing.setdefault("ttft", time.perf_counter() - t0)
+                parts.append(delta)
+                yield delta
+        timing["total"] = time.perf_counter() - t0
+        content = "".join(parts)
+        # Hanya respons lengkap yang masuk cache; stream yang dibatalkan tidak
+        if use_cache and content:
+            cache_put(ck, model, content)
+    finally:
+        r.close()
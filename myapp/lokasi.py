@@ -0,0 +1,129 @@
+import re
+from typing import List
+import numpy as np
+import pandas as pd
+
+STOPWORDS = {"pusat", "timur", "barat", "utara", "selatan"}
+
+RE_PROV = re.compile(r"^(provinsi[^\n]*)", re.I | re.M)
+RE_KOTA = re.compile(r"^(kota[^\n]*)", re.I | re.M)
+RE_KAB = re.compile(r"^(kabupaten[^\n]*)", re.I | re.M)
+# Nilai field yang terpotong ke baris berikutnya ("Kota Administrasi Jakarta\nPusat"): baris tanpa label disambung
+RE_WRAPPED = re.compile(r"^((?:provinsi|kabupaten|kota)[^\n:]*:[^\n]*)\n([^\n:]+)$", re.I | re.M)
+RE_PREFIX = re.compile(
+    r"(provinsi|kabupaten|kota|daerah(?:\s+khusus|\s+istimewa)?|dki|kab\.|kota\.|prov\.)", re.I
+)
+RE_NONALPHA = re.compile(r"[^a-z\s]")
+
+def clean_tokens(name: str) -> List[str]:
+    name = RE_NONALPHA.sub("", RE_PREFIX.sub("", name).lower()).strip()
+    return [t for t in name.split() if t and t not in STOPWORDS]
+
+def key_token(name: str) -> str | None:
+    toks = clean_tokens(name)
+    return toks[-1].title() if toks else None
+
+def extract_level(text: pd.Series, pattern: re.Pattern) -> pd.Series:
+    line = text.str.replace(RE_WRAPPED, r"\1 \2", regex=True).str.extract(pattern, expand=False)
+    return line.str.split(":", n=1).str[-1].str.strip().fillna("").astype(object)
+
+def explode_names(col: pd.Series) -> pd.Series:
+    parts = col.str.split(r",\s*", regex=True).explode()
+    return parts[parts.notna() & (parts != "") & ~parts.str.isdigit().fillna(False).astype(bool)]
+
+def key_table(names) -> dict:
+    return {n: key_token(n) or n for n in names}
+
+def gazetteer_hits(text: pd.Series, gaz, level: str | None = None) -> pd.DataFrame:
+    # Scan hanya teks unik, lalu sebarkan ke baris lewat merge
+    codes, uniques = pd.factorize(text)
+    per_text = pd.DataFrame(
+        [(uid, gid, surface) for uid, t in enumerate(uniques) for gid, surface in gaz.match(t, level)],
+        columns=["uid", "loc_id", "raw"],
+    ).astype({"uid": "int64", "loc_id": "int64"})
+    hits = pd.DataFrame({"row": np.arange(len(text), dtype="int32"), "uid": codes}).merge(per_text, on="uid")
+    names, levels = np.asarray(gaz.names, dtype=object), np.asarray(gaz.levels, dtype=object)
+    return pd.DataFrame({
+        "level": levels[hits["loc_id"].to_numpy()],
+        "row": hits["row"].to_numpy(),
+        "raw": hits["raw"].to_numpy(),
+        "loc": names[hits["loc_id"].to_numpy()],
+        "loc_id": hits["loc_id"].to_numpy().astype("int16"),
+    })
+
+def structured_hits(text: pd.Series, prov: pd.Series, kota: pd.Series, gaz) -> pd.DataFrame:
+    # Nilai field Provinsi / Kabupaten-Kota (label sudah dibuang extract_level) diutamakan;
+    # teks bebas hanya dipakai untuk level yang tidak mendapat hit dari field-nya
+    fields = pd.concat([gazetteer_hits(prov, gaz, "provinsi"), gazetteer_hits(kota, gaz, "kota")], ignore_index=True)
+    free = gazetteer_hits(text, gaz)
+    level_key = lambda t: t["row"].to_numpy(dtype="int64") * 2 + (t["level"] == "kota").to_numpy()
+    hits = pd.concat([fields, free[~np.isin(level_key(free), level_key(fields))]], ignore_index=True)
+    return hits.sort_values("row", kind="stable", ignore_index=True)
+
+def normalise(df: pd.DataFrame, gaz=None) -> pd.DataFrame:
+    # Ekstraksi provinsi/kota sekali per snapshot; hasil list disimpan sebagai
+    # tabel (level, row, loc) dengan loc kategorikal = array id + lookup
+    text = df["lokasi_penempatan"] if "lokasi_penempatan" in df else pd.Series("", index=df.index)
+    text = text.astype(object)
+    prov = extract_level(text, RE_PROV)
+    kota = extract_level(text, RE_KOTA)
+    kota = kota.where(kota != "", extract_level(text, RE_KAB))
+    df["provinsi"], df["kota"] = prov, kota
+
+    frames = []
+    for level, col in [("provinsi", prov), ("kota", kota)]:
+        parts = explode_names(col)
+        frames.append(pd.DataFrame({"level": level, "row": parts.index.astype("int32"), "raw": parts.to_numpy()}))
+    tbl = pd.concat(frames, ignore_index=True)
+    tbl["loc"] = tbl["raw"].map(key_table(tbl["raw"].unique()))
+    tbl["loc_id"] = np.int16(-1)
+
+    if gaz is not None:
+        # Gazetteer diutamakan; heuristik key_token hanya untuk level tanpa hit
+        hits = structured_hits(text, prov, kota, gaz)
+        level_key = lambda t: t["row"].to_numpy(dtype="int64") * 2 + (t["level"] == "kota").to_numpy()
+        tbl = pd.concat([hits, tbl[~np.isin(level_key(tbl), level_key(hits))]], ignore_index=True)
+    return tbl.astype({"level": "category", "raw": "category", "loc": "category"})
+
+class ListColumn:
+    # Kolom list-of-str ringkas: baris i = ids[offsets[i]:offsets[i+1]], id -> labels.
+    # Urutan pasangan sama dengan tabel lokasi (urutan di dalam list dipertahankan)
+    def __init__(self, offsets: np.ndarray, ids: np.ndarray, labels):
+        self.offsets = offsets.astype("int32")
+        self.ids = ids.astype("int32")
+        self.labels = np.asarray(labels, dtype=object)
+
+    @classmethod
+    def from_table(cls, tbl: pd.DataFrame, n_rows: int, level: str) -> "ListColumn":
+        sub = tbl[tbl["level"] == level]
+        rows = sub["row"].to_numpy(dtype="int64")
+        order = np.argsort(rows, kind="stable")
+        ids, labels = pd.factorize(sub["loc"].astype(object).to_numpy()[order])
+        offsets = np.zeros(n_rows + 1, dtype="int64")
+        np.cumsum(np.bincount(rows, minlength=n_rows), out=offsets[1:])
+        return cls(offsets, ids, labels)
+
+    @classmethod
+    def from_lists(cls, col: pd.Series) -> "ListColumn":
+        ids, labels = pd.factorize(pd.Series([v for lst in col for v in lst], dtype=object))
+        offsets = np.zeros(len(col) + 1, dtype="int64")
+        np.cumsum(col.map(len).to_numpy(), out=offsets[1:])
+        return cls(offsets, ids, labels)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def rows(self) -> np.ndarray:
+        return np.repeat(np.arange(len(self), dtype="int32"), np.diff(self.offsets))
+
+    def values(self) -> np.ndarray:
+        return self.labels[self.ids]
+
+    def lists(self, positions: np.ndarray) -> List[list]:
+        return [list(self.labels[self.ids[self.offsets[i]:self.offsets[i + 1]]]) for i in positions]
+
+    def nbytes(self) -> int:
+        return self.offsets.nbytes + self.ids.nbytes + sum(len(str(v)) for v in self.labels)
+
+def to_lists(tbl: pd.DataFrame, n_rows: int, level: str) -> List[list]:
+    return ListColumn.from_table(tbl, n_rows, level).lists(range(n_rows))
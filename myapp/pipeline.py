@@ -0,0 +1,61 @@
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+from myapp import cubes, facets, recommend, search, store
+
+LINK_BASE = "https://simbelmawa.kemdikbud.go.id/magang/lowongan/"
+
+class Pipeline:
+    # Dataset siap pakai + semua index untuk satu versi katalog; satu objek dibagi semua sesi
+    def __init__(self, head: dict, folder: str = "data_lowongan"):
+        df, lists = store.load_compact(folder, head=head)
+        self.head = head
+        self.snapshot = df.attrs.get("snapshot", "")
+        self._df = df
+        self.lists = lists
+        self.search = search.build_indexes(df)
+        self.facets = facets.build_facets(df, lists)
+        self.recommender = recommend.load_or_build(df)
+        self.cubes = cubes.build_cubes(df, lists)
+        self.memory_mb = (df.memory_usage(deep=True).sum() + sum(c.nbytes() for c in lists.values())) / 2**20
+        self._trends = store.load_trends(head=head)
+
+    @property
+    def df(self) -> pd.DataFrame:
+        # Dataset bersama semua sesi, hanya-baca: pemanggil yang perlu mengubah kolom memakai .copy() sendiri
+        return self._df
+
+    @property
+    def trends(self) -> pd.DataFrame:
+        return self._trends
+
+    def text_mask(self, query: str, index_name: str, fields: List[str], substring: bool = False) -> np.ndarray:
+        positions = None if substring else self.search[index_name].search(query)
+        if positions is None:
+            return search.substring_mask(self._df, query, fields)
+        return search.positions_mask(len(self._df), positions)
+
+    def filter_mask(
+        self, selections: Dict[str, List[str]], baru: bool = False, keyword: str = "", query: str = "",
+        substring: bool = False,
+    ) -> np.ndarray:
+        # Filter sidebar dashboard dan API: facet (bitmap), lowongan baru, keyword deskripsi, global search
+        mask = facets.resolve(self.facets, selections, len(self._df))
+        if baru:
+            mask &= self._df["baru"].to_numpy(dtype=bool)
+        if keyword:
+            mask &= self.text_mask(keyword, "deskripsi", ["deskripsi"], substring)
+        if query:
+            mask &= self.text_mask(query, "semua", search.SEARCH_FIELDS, substring)
+        return mask
+
+def links(slugs) -> pd.Series:
+    # Link dibentuk hanya untuk baris yang ditampilkan, tidak disimpan di dataset
+    return LINK_BASE + pd.Series(slugs, dtype=object).astype(str)
+
+def catalog_key(head: dict | None, folder: str = "data_lowongan") -> str:
+    # Berubah hanya saat katalog berubah: dataset aktif atau tabel tren
+    if not head:
+        return ""
+    current = head["current"].get(folder, {}).get("snapshot", "")
+    return f"{current}|{(head.get('trends') or {}).get('signature', '')}"
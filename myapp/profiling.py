@@ -0,0 +1,114 @@
+import contextlib, json, os, pathlib, sys, threading, time
+from typing import Iterator
+from myapp import llm
+
+LOG_PATH = pathlib.Path("data_store/profile.jsonl")
+ENV_FLAG = "MBKM_DEBUG"
+
+# Satu rekaman per rerun, per thread script (tiap sesi Streamlit punya thread sendiri)
+_local = threading.local()
+_log_lock = threading.Lock()
+
+def enabled_by_env() -> bool:
+    return os.environ.get(ENV_FLAG) == "1"
+
+def start(enabled: bool, session: str = "") -> None:
+    if not enabled:
+        _local.run = None
+        return
+    _local.run = {
+        "t0": time.perf_counter(),
+        "session": session,
+        "stages": {},
+        "counts": {},
+        "llm0": dict(llm.stats),
+    }
+
+def active() -> bool:
+    return getattr(_local, "run", None) is not None
+
+@contextlib.contextmanager
+def stage(name: str) -> Iterator[None]:
+    # Tanpa rekaman aktif hanya satu getattr: aman dipasang di jalur panas
+    run = getattr(_local, "run", None)
+    if run is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        run["stages"][name] = run["stages"].get(name, 0.0) + time.perf_counter() - t0
+
+def count(name: str, n: int = 1) -> None:
+    run = getattr(_local, "run", None)
+    if run is not None:
+        run["counts"][name] = run["counts"].get(name, 0) + n
+
+def rss_mb() -> float | None:
+    # /proc (Linux), lalu psutil bila terpasang; None jika tidak ada sumber (mis. Windows tanpa psutil)
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss / 2**20
+
+def peak_rss_mb() -> float | None:
+    # resource hanya ada di Unix: diimpor di sini agar modul ini tetap bisa diimpor di Windows
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / 2**20
+    # ru_maxrss: KiB di Linux, byte di macOS
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (2**20 if sys.platform == "darwin" else 1024)
+
+def round_mb(value: float | None) -> float | None:
+    return None if value is None else round(value, 1)
+
+def write_log(record: dict, path: pathlib.Path = LOG_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _log_lock, open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+def finish(extra: dict | None = None, path: pathlib.Path = LOG_PATH) -> dict | None:
+    # Tutup rekaman rerun: durasi tahap, hit/miss cache, memori; ditulis ke JSONL
+    run = getattr(_local, "run", None)
+    _local.run = None
+    if run is None:
+        return None
+    record = {
+        "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "session": run["session"],
+        "total_s": round(time.perf_counter() - run["t0"], 6),
+        "stages": {k: round(v, 6) for k, v in run["stages"].items()},
+        "counts": run["counts"],
+        "llm": {k: llm.stats[k] - run["llm0"].get(k, 0) for k in llm.stats},
+        "rss_mb": round_mb(rss_mb()),
+        "peak_rss_mb": round_mb(peak_rss_mb()),
+        **(extra or {}),
+    }
+    write_log(record, path)
+    return record
+
+@contextlib.contextmanager
+def event(name: str, path: pathlib.Path = LOG_PATH) -> Iterator[None]:
+    # Kerja di luar rerun (mis. CSV dibuat saat tombol download diklik) dicatat sebagai baris tersendiri
+    if not enabled_by_env():
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        write_log({"ts": time.strftime("%Y-%m-%dT%H:%M:%S"), "event": name,
+                   "seconds": round(time.perf_counter() - t0, 6), "rss_mb": round_mb(rss_mb())}, path)
@@ -0,0 +1,121 @@
+import pathlib
+from typing import List
+import numpy as np
+import pandas as pd
+from myapp import search, store
+
+POSISI_WEIGHT = 3
+BM25_K1 = 1.2
+BM25_B = 0.75
+TOP_K = 20
+RERANK_POOL = 100
+EXPANSION_WEIGHT = 0.5
+
+def doc_tokens(df: pd.DataFrame) -> pd.DataFrame:
+    # Pasangan (row, tok, tf); token posisi dihitung POSISI_WEIGHT kali (BM25F sederhana)
+    col = lambda f: df[f].astype(object).fillna("").astype(str).map(search.index_tokens)
+    parts = []
+    for field, weight in (("posisi_magang", POSISI_WEIGHT), ("deskripsi", 1)):
+        tokens = col(field)
+        parts.append(pd.DataFrame({
+            "row": np.repeat(np.arange(len(tokens), dtype="int32"), tokens.map(len).to_numpy(dtype="int64")),
+            "tok": [t for toks in tokens for t in toks],
+            "tf": np.float32(weight),
+        }))
+    pairs = pd.concat(parts, ignore_index=True)
+    return pairs.groupby(["tok", "row"], sort=True, observed=True)["tf"].sum().reset_index()
+
+class Recommender:
+    # Matriks BM25 term-major (CSR): vocab terurut, offsets per term, rows & weights per posting
+    def __init__(self, vocab: np.ndarray, offsets: np.ndarray, rows: np.ndarray, weights: np.ndarray, n_rows: int):
+        self.vocab, self.offsets, self.rows, self.weights, self.n_rows = vocab, offsets, rows, weights, n_rows
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, k1: float = BM25_K1, b: float = BM25_B) -> "Recommender":
+        pairs = doc_tokens(df)
+        n_rows = len(df)
+        doc_len = np.bincount(pairs["row"], weights=pairs["tf"], minlength=n_rows)
+        avg_len = doc_len.mean() if n_rows and doc_len.mean() > 0 else 1.0
+        vocab, tok_id = np.unique(pairs["tok"].to_numpy(dtype=str), return_inverse=True)
+        df_t = np.bincount(tok_id, minlength=len(vocab))
+        idf = np.log1p((n_rows - df_t + 0.5) / (df_t + 0.5))
+        tf = pairs["tf"].to_numpy(dtype="float64")
+        rows = pairs["row"].to_numpy(dtype="int32")
+        norm = k1 * (1 - b + b * doc_len[rows] / avg_len)
+        weights = (idf[tok_id] * tf * (k1 + 1) / (tf + norm)).astype("float32")
+        offsets = np.append(np.searchsorted(tok_id, np.arange(len(vocab))), len(rows)).astype("int64")
+        return cls(vocab, offsets, rows, weights, n_rows)
+
+    def save(self, path: pathlib.Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp.npz")
+        np.savez(tmp, vocab=self.vocab, offsets=self.offsets, rows=self.rows, weights=self.weights,
+                 n_rows=np.int64(self.n_rows))
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: pathlib.Path) -> "Recommender":
+        with np.load(path) as z:
+            return cls(z["vocab"], z["offsets"], z["rows"], z["weights"], int(z["n_rows"]))
+
+    def scores(self, tokens: List[str], weights: List[float] | None = None) -> np.ndarray:
+        # Satu bincount atas gabungan posting list semua token query
+        weights = weights or [1.0] * len(tokens)
+        ids = np.searchsorted(self.vocab, tokens)
+        slices, qw = [], []
+        for i, tok, w in zip(ids, tokens, weights):
+            if i < len(self.vocab) and self.vocab[i] == tok:
+                slices.append(np.arange(self.offsets[i], self.offsets[i + 1]))
+                qw.append(np.full(self.offsets[i + 1] - self.offsets[i], w, dtype="float32"))
+        if not slices:
+            return np.zeros(self.n_rows, dtype="float32")
+        idx = np.concatenate(slices)
+        return np.bincount(self.rows[idx], weights=self.weights[idx] * np.concatenate(qw),
+                           minlength=self.n_rows).astype("float32")
+
+    def top_k(self, scores: np.ndarray, k: int = 20, candidates: np.ndarray | None = None) -> np.ndarray:
+        # Posisi baris dengan skor > 0 tertinggi, dibatasi ke kandidat (hasil filter)
+        pool = np.flatnonzero(scores > 0) if candidates is None else candidates[scores[candidates] > 0]
+        if len(pool) > k:
+            pool = pool[np.argpartition(-scores[pool], k - 1)[:k]]
+        return pool[np.argsort(-scores[pool], kind="stable")]
+
+def query_tokens(text: str) -> List[str]:
+    return list(dict.fromkeys(search.index_tokens(text)))
+
+def expansion_tokens(keywords: List[str]) -> tuple[List[str], List[float]]:
+    # Kata kunci LLM -> token berbobot; frasa panjang dibagi rata ke tokennya
+    weight: dict[str, float] = {}
+    for kw in keywords:
+        toks = query_tokens(kw)
+        for t in toks:
+            weight[t] = weight.get(t, 0.0) + 1.0 / len(toks)
+    return list(weight), list(weight.values())
+
+def matrix_path(snapshot: str, store_dir: pathlib.Path = store.STORE_DIR) -> pathlib.Path:
+    return store_dir / f"bm25__{snapshot}.npz"
+
+def load_or_build(df: pd.DataFrame, store_dir: pathlib.Path = store.STORE_DIR) -> Recommender:
+    # Dibangun sekali per snapshot lalu disimpan; proses berikutnya cukup np.load
+    snapshot = df.attrs.get("snapshot")
+    path = matrix_path(snapshot, store_dir) if snapshot else None
+    if path is not None and path.exists():
+        rec = Recommender.load(path)
+        if rec.n_rows == len(df):
+            return rec
+    rec = Recommender.build(df)
+    if path is not None:
+        rec.save(path)
+    return rec
+
+def rank(rec: Recommender, posisi: str, candidates: np.ndarray, keywords: list | None = None, k: int = TOP_K) -> np.ndarray:
+    # BM25 lokal atas posisi + deskripsi; kata kunci AI (opsional) hanya menata ulang kandidat teratas
+    base = rec.scores(query_tokens(posisi))
+    if not keywords:
+        return rec.top_k(base, k, candidates)
+    pool = rec.top_k(base, max(RERANK_POOL, k), candidates)
+    exp = rec.scores(*expansion_tokens(keywords))
+    if not len(pool) or not exp[pool].any():
+        return pool[:k]
+    combined = base[pool] / base[pool].max() + EXPANSION_WEIGHT * exp[pool] / exp[pool].max()
+    return pool[np.argsort(-combined, kind="stable")[:k]]
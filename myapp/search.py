@@ -0,0 +1,70 @@
+import re, unicodedata
+from typing import List
+import numpy as np
+import pandas as pd
+
+RE_WORD = re.compile(r"[a-z0-9]+")
+SEARCH_FIELDS = ["deskripsi", "posisi_magang", "mitra", "provinsi", "kota"]
+
+def fold(text: str) -> str:
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().lower()
+
+def query_tokens(query: str) -> List[str]:
+    return RE_WORD.findall(fold(query))
+
+def index_tokens(text: str) -> List[str]:
+    # Token asli + bentuk tanpa akhiran "-nya" (kemampuannya -> kemampuan)
+    toks = RE_WORD.findall(fold(text))
+    return toks + [t[:-3] for t in toks if t.endswith("nya") and len(t) > 6]
+
+class InvertedIndex:
+    def __init__(self, texts: pd.Series):
+        tokens = texts.fillna("").astype(str).map(index_tokens)
+        pairs = pd.DataFrame({
+            "row": np.repeat(np.arange(len(tokens), dtype="int32"), tokens.map(len).to_numpy(dtype="int64")),
+            "tok": [t for toks in tokens for t in toks],
+        }).drop_duplicates().sort_values(["tok", "row"], kind="stable")
+        self.n_rows = len(texts)
+        self.vocab = pairs["tok"].drop_duplicates().to_numpy(dtype=str)
+        self.rows = pairs["row"].to_numpy(dtype="int32")
+        self.offsets = np.searchsorted(pairs["tok"].to_numpy(dtype=str), self.vocab, side="left")
+        self.offsets = np.append(self.offsets, len(self.rows))
+
+    def lookup(self, token: str, prefix: bool = True) -> np.ndarray:
+        lo = np.searchsorted(self.vocab, token, side="left")
+        hi = np.searchsorted(self.vocab, token + "\uffff", side="left") if prefix else lo + int(
+            lo < len(self.vocab) and self.vocab[lo] == token
+        )
+        if hi <= lo:
+            return np.empty(0, dtype="int32")
+        hits = self.rows[self.offsets[lo]:self.offsets[hi]]
+        return hits if hi - lo == 1 else np.unique(hits)
+
+    def search(self, query: str, prefix: bool = True) -> np.ndarray | None:
+        # Irisan posting list semua token; None jika query tanpa token (pakai fallback)
+        toks = query_tokens(query)
+        if not toks:
+            return None
+        result = None
+        for tok in sorted(set(toks), key=len, reverse=True):
+            hits = self.lookup(tok, prefix)
+            result = hits if result is None else np.intersect1d(result, hits, assume_unique=True)
+            if not len(result):
+                break
+        return result
+
+def build_indexes(df: pd.DataFrame) -> dict:
+    col = lambda f: df[f].astype(object).fillna("").astype(str)
+    semua = col(SEARCH_FIELDS[0]).str.cat([col(f) for f in SEARCH_FIELDS[1:]], sep="\n")
+    return {"deskripsi": InvertedIndex(col("deskripsi")), "semua": InvertedIndex(semua)}
+
+def substring_mask(df: pd.DataFrame, query: str, fields: List[str]) -> np.ndarray:
+    mask = np.zeros(len(df), dtype=bool)
+    for f in fields:
+        mask |= df[f].str.contains(query, case=False, regex=False, na=False).to_numpy(dtype=bool)
+    return mask
+
+def positions_mask(n_rows: int, positions: np.ndarray) -> np.ndarray:
+    mask = np.zeros(n_rows, dtype=bool)
+    mask[positions] = True
+    return mask
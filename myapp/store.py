@@ -0,0 +1,437 @@
+import datetime, hashlib, json, os, pathlib, re
+from typing import List
+import numpy as np
+import pandas as pd
+from myapp import gazetteer, lokasi
+
+STORE_DIR = pathlib.Path("data_store")
+STORE_VERSION = 6
+SNAPSHOT_FOLDERS = ["data_lowongan_lama", "data_lowongan"]
+KATEGORI_COLS = ["mitra", "posisi_magang", "kategori_posisi"]
+RE_SNAPSHOT_DATE = re.compile(r"data-(\d{2})-(\d{2})-(\d{4})$")
+
+def file_hash(path: pathlib.Path) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def snapshot_date(path: pathlib.Path) -> str:
+    m = RE_SNAPSHOT_DATE.match(path.stem)
+    if m:
+        return f"{m.group(3)}-{m.group(2)}-{m.group(1)}"
+    return datetime.date.fromtimestamp(path.stat().st_mtime).isoformat()
+
+def read_snapshot(path: pathlib.Path) -> pd.DataFrame:
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    if "props" in raw and "data" in raw["props"] and "data" in raw["props"]["data"]:
+        return pd.DataFrame(raw["props"]["data"]["data"])
+    return pd.DataFrame()
+
+def row_keys(df: pd.DataFrame) -> pd.Series:
+    # Kunci dedup: id_lowongan, atau slug bila id kosong
+    slug = "slug:" + (df["slug"].astype(str) if "slug" in df else pd.Series(df.index.astype(str), index=df.index))
+    if "id_lowongan" not in df:
+        return slug
+    ids = pd.to_numeric(df["id_lowongan"], errors="coerce")
+    return ids.astype("Int64").astype(str).where(ids.notna(), slug).astype(object)
+
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    cols = sorted(c for c in df.columns if not c.startswith("_"))
+    return pd.util.hash_pandas_object(df[cols].astype(str), index=False).to_numpy()
+
+def to_columnar(df: pd.DataFrame) -> pd.DataFrame:
+    for col in KATEGORI_COLS:
+        if col in df:
+            df[col] = df[col].astype("category")
+    return df
+
+def load_manifest(store_dir: pathlib.Path = STORE_DIR) -> dict:
+    path = store_dir / "manifest.json"
+    if path.exists():
+        manifest = json.loads(path.read_text("utf-8"))
+        if manifest.get("version") == STORE_VERSION:
+            return manifest
+    return {"version": STORE_VERSION, "snapshots": {}, "current": {}}
+
+def write_json(obj: dict, path: pathlib.Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(obj, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+def save_manifest(manifest: dict, store_dir: pathlib.Path = STORE_DIR) -> None:
+    write_json(manifest, store_dir / "manifest.json")
+    write_json(catalog_head(manifest), store_dir / "catalog_head.json")
+
+def read_head(store_dir: pathlib.Path = STORE_DIR) -> dict | None:
+    # Ringkasan katalog (snapshot terbaru + dataset aktif), dibaca tiap rerun
+    path = store_dir / "catalog_head.json"
+    if not path.exists():
+        return None
+    head = json.loads(path.read_text("utf-8"))
+    return head if head.get("version") == STORE_VERSION else None
+
+def current_signature(state: dict) -> str:
+    return hashlib.sha1("".join(sorted(state.get("applied", {}).values())).encode()).hexdigest()[:12]
+
+def catalog_head(manifest: dict) -> dict:
+    snaps = chain(manifest)
+    latest = None
+    if snaps:
+        key, ent = snaps[-1]
+        latest = {
+            "key": key,
+            "date": ent["date"],
+            "rows": ent["rows"],
+            "sha1": ent["sha1"],
+            "diff": (ent["diff"] or {}).get("path"),
+        }
+    return {
+        "version": STORE_VERSION,
+        "snapshots": len(snaps),
+        "latest": latest,
+        "current": {
+            folder: {"rows": state["rows"], "snapshot": current_signature(state), "artifacts": state["artifacts"]}
+            for folder, state in manifest["current"].items()
+        },
+        "trends": {
+            "path": manifest.get("trends", {}).get("path"),
+            "signature": hashlib.sha1("".join(sorted(manifest.get("trends", {}).get("applied", {}).values())).encode()).hexdigest()[:12],
+        },
+    }
+
+def chain(manifest: dict, folder: str | None = None) -> List[tuple]:
+    items = [(k, v) for k, v in manifest["snapshots"].items() if folder is None or v["folder"] == folder]
+    return sorted(items, key=lambda kv: (kv[1]["date"], kv[0]))
+
+def ingest_snapshots(manifest: dict, folders: List[str], store_dir: pathlib.Path) -> bool:
+    # Konversi hanya snapshot yang baru/berubah (mtime+size, lalu hash)
+    entries = manifest["snapshots"]
+    seen, dirty = set(), False
+    for folder in folders:
+        folder_path = pathlib.Path(folder)
+        for file in sorted(folder_path.glob("*.json")):
+            key = file.as_posix()
+            seen.add(key)
+            stat = file.stat()
+            ent = entries.get(key)
+            rows_path = f"{store_dir / f'{folder_path.name}__{file.stem}'}.parquet"
+            if ent and all(pathlib.Path(p).exists() for p in ent["artifacts"].values()):
+                if ent["mtime_ns"] == stat.st_mtime_ns and ent["size"] == stat.st_size:
+                    continue
+                digest = file_hash(file)
+                if ent["sha1"] == digest:
+                    ent.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                    dirty = True
+                    continue
+            else:
+                digest = file_hash(file)
+
+            df = read_snapshot(file)
+            artifacts = {}
+            if not df.empty:
+                df["_key"] = row_keys(df)
+                df["_hash"] = row_hashes(df)
+                store_dir.mkdir(parents=True, exist_ok=True)
+                to_columnar(df).to_parquet(rows_path, index=False)
+                artifacts["rows"] = rows_path
+            entries[key] = {
+                "folder": folder_path.as_posix(),
+                "date": snapshot_date(file),
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "sha1": digest,
+                "rows": len(df),
+                "artifacts": artifacts,
+                "diff": None,
+            }
+            dirty = True
+
+    folder_keys = {pathlib.Path(f).as_posix() for f in folders}
+    for key in [k for k, v in entries.items() if v["folder"] in folder_keys and k not in seen]:
+        for p in entries[key]["artifacts"].values():
+            pathlib.Path(p).unlink(missing_ok=True)
+        del entries[key]
+        dirty = True
+    return dirty
+
+def snapshot_versions(ent: dict) -> pd.Series:
+    if not ent["artifacts"]:
+        return pd.Series(dtype="uint64")
+    t = pd.read_parquet(ent["artifacts"]["rows"], columns=["_key", "_hash"]).drop_duplicates("_key", keep="last")
+    return pd.Series(t["_hash"].to_numpy(), index=t["_key"].astype(object))
+
+def update_diffs(manifest: dict, store_dir: pathlib.Path) -> bool:
+    # Diff tiap snapshot terhadap snapshot sebelumnya (lintas folder, urut tanggal)
+    dirty, prev_key, prev = False, None, None
+    for key, ent in chain(manifest):
+        prev_sha1 = manifest["snapshots"][prev_key]["sha1"] if prev_key else None
+        diff = ent.get("diff")
+        if diff and diff["prev"] == prev_key and diff["prev_sha1"] == prev_sha1 and pathlib.Path(diff["path"]).exists():
+            prev_key, prev = key, None
+            continue
+        if prev is None:
+            prev = snapshot_versions(manifest["snapshots"][prev_key]) if prev_key else pd.Series(dtype="uint64")
+        cur = snapshot_versions(ent)
+        common = cur.index.intersection(prev.index)
+        parts = {
+            "added": cur.index.difference(prev.index),
+            "removed": prev.index.difference(cur.index),
+            "changed": common[cur[common].to_numpy() != prev[common].to_numpy()],
+        }
+        store_dir.mkdir(parents=True, exist_ok=True)
+        path = f"{store_dir / pathlib.Path(ent['folder']).name}__{pathlib.Path(key).stem}.diff.parquet"
+        pd.DataFrame({
+            "_key": np.concatenate([np.asarray(v, dtype=object) for v in parts.values()]),
+            "status": np.repeat(list(parts), [len(v) for v in parts.values()]),
+        }).astype({"status": "category"}).to_parquet(path, index=False)
+        ent["diff"] = {"prev": prev_key, "prev_sha1": prev_sha1, "path": path, **{k: len(v) for k, v in parts.items()}}
+        prev_key, prev = key, cur
+        dirty = True
+    return dirty
+
+def newer_version(new: pd.Series, old: pd.Series) -> np.ndarray:
+    # _versi = "updated_at|tanggal snapshot". updated_at dibandingkan sebagai waktu; jika salah satu
+    # kosong, snapshot yang lebih baru menang (string kosong tidak boleh mengalahkan timestamp asli)
+    new_upd, new_date = new.str.split("|", n=1).str[0], new.str.split("|", n=1).str[-1]
+    old_upd, old_date = old.str.split("|", n=1).str[0], old.str.split("|", n=1).str[-1]
+    parse = lambda s: pd.to_datetime(s.replace("", None), utc=True, errors="coerce", format="ISO8601")
+    new_t, old_t = parse(new_upd), parse(old_upd)
+    later = (new_date.to_numpy(dtype=object) >= old_date.to_numpy(dtype=object))
+    both = (new_t.notna() & old_t.notna()).to_numpy()
+    by_time = ((new_t > old_t) | ((new_t == old_t) & later)).to_numpy()
+    return np.where(both, by_time, later)
+
+def drop_rows(cur: pd.DataFrame, tbl: pd.DataFrame, keep: np.ndarray) -> tuple[pd.DataFrame, pd.DataFrame]:
+    # Buang baris dari dataset aktif + tabel lokasinya (nomor baris digeser)
+    new_pos = np.cumsum(keep) - 1
+    tbl = tbl[keep[tbl["row"].to_numpy()]]
+    tbl = tbl.assign(row=new_pos[tbl["row"].to_numpy()].astype("int32"))
+    return cur[keep].reset_index(drop=True), tbl.reset_index(drop=True)
+
+def update_current(manifest: dict, folder: str, store_dir: pathlib.Path) -> bool:
+    # Dataset aktif per folder: versi terbaru per lowongan, diperbarui per delta
+    snaps = chain(manifest, folder)
+    state = manifest["current"].get(folder) or {}
+    applied = dict(state.get("applied", {}))
+    sha1s = {k: v["sha1"] for k, v in snaps}
+    if any(sha1s.get(k) != h for k, h in applied.items()) or not all(
+        pathlib.Path(p).exists() for p in state.get("artifacts", {}).values()
+    ):
+        applied = {}
+    pending = [(k, v) for k, v in snaps if k not in applied]
+    if not pending and state:
+        return False
+
+    cur = tbl = None
+    if applied and state.get("rows"):
+        cur = pd.read_parquet(state["artifacts"]["rows"])
+        tbl = pd.read_parquet(state["artifacts"]["lokasi"])
+    for key, ent in pending:
+        applied[key] = ent["sha1"]
+        if not ent["artifacts"]:
+            continue
+        snap = pd.read_parquet(ent["artifacts"]["rows"]).drop_duplicates("_key", keep="last")
+        updated = snap["updated_at"] if "updated_at" in snap else pd.Series(None, index=snap.index)
+        snap["_versi"] = updated.astype(object).where(updated.notna(), "").astype(str) + "|" + ent["date"]
+        if cur is None:
+            delta = snap
+        else:
+            old = cur.set_index("_key")
+            old_hash, old_versi = snap["_key"].map(old["_hash"]), snap["_key"].map(old["_versi"])
+            known = old_hash.notna().to_numpy()
+            newer = np.zeros(len(snap), dtype=bool)
+            newer[known] = newer_version(snap["_versi"][known], old_versi[known].astype(str))
+            delta = snap[~known | ((snap["_hash"] != old_hash).to_numpy() & newer)]
+        if delta.empty:
+            continue
+        # Normalisasi lokasi hanya untuk baris delta
+        delta = delta.reset_index(drop=True)
+        dtbl = lokasi.normalise(delta, gazetteer.build())
+        if cur is None:
+            cur, tbl = delta, dtbl
+            continue
+        cur, tbl = drop_rows(cur, tbl, ~cur["_key"].isin(delta["_key"]).to_numpy())
+        dtbl["row"] += len(cur)
+        cur = pd.concat([cur, delta], ignore_index=True)
+        as_obj = {"level": object, "raw": object, "loc": object}
+        tbl = pd.concat([tbl.astype(as_obj), dtbl.astype(as_obj)], ignore_index=True)
+
+    # Lowongan yang sudah ditutup (tidak ada di snapshot terbaru folder ini) dikeluarkan
+    latest = next((ent for _, ent in reversed(snaps) if ent["artifacts"]), None)
+    if cur is not None and latest is not None:
+        live = pd.read_parquet(latest["artifacts"]["rows"], columns=["_key"])["_key"]
+        keep = cur["_key"].isin(live).to_numpy()
+        if not keep.all():
+            cur, tbl = drop_rows(cur, tbl, keep)
+
+    # Nama artefak memuat signature versi: file lama tidak ditimpa, jadi posisi baris yang dipegang
+    # sesi lama (ekspor CSV) tetap menunjuk baris yang sama
+    name = pathlib.Path(folder).name
+    base = store_dir / f"current__{name}__{current_signature({'applied': applied})}"
+    artifacts = {"rows": f"{base}.parquet", "lokasi": f"{base}.lokasi.parquet"} if cur is not None else {}
+    if cur is not None:
+        store_dir.mkdir(parents=True, exist_ok=True)
+        to_columnar(cur).to_parquet(artifacts["rows"], index=False)
+        tbl.astype({"level": "category", "raw": "category", "loc": "category"}).to_parquet(artifacts["lokasi"], index=False)
+    # Simpan versi aktif + satu versi sebelumnya; sisanya (dan nama lama tanpa signature) dibuang
+    keep = {pathlib.Path(p).name for p in [*artifacts.values(), *state.get("artifacts", {}).values()]}
+    for path in [*store_dir.glob(f"current__{name}__*.parquet"), *store_dir.glob(f"current__{name}.*parquet")]:
+        if path.name not in keep:
+            path.unlink(missing_ok=True)
+    manifest["current"][folder] = {
+        "applied": applied, "rows": 0 if cur is None else len(cur), "artifacts": artifacts,
+        "previous": current_signature(state) if state else None,
+    }
+    prune_bm25(manifest, store_dir)
+    return True
+
+def prune_bm25(manifest: dict, store_dir: pathlib.Path) -> None:
+    # Matriks BM25 (recommend.matrix_path) per versi dataset: simpan versi aktif + sebelumnya tiap folder
+    sigs = {sig for ent in manifest["current"].values() for sig in (current_signature(ent), ent.get("previous"))}
+    keep = {f"bm25__{sig}" for sig in sigs if sig}
+    for path in store_dir.glob("bm25__*.npz"):
+        if path.name.split(".", 1)[0] not in keep:
+            path.unlink(missing_ok=True)
+
+TREND_DIMS = {"mitra": "mitra", "posisi": "posisi_magang"}
+
+def trend_members(df: pd.DataFrame) -> pd.DataFrame:
+    # Keanggotaan baris per dimensi tren (row, dim, value); provinsi lewat normalisasi lokasi
+    rows = np.arange(len(df), dtype="int32")
+    parts = [pd.DataFrame({"row": rows, "dim": "semua", "value": ""})]
+    for dim, col in TREND_DIMS.items():
+        if col in df:
+            parts.append(pd.DataFrame({"row": rows, "dim": dim, "value": df[col].astype(object).to_numpy()}))
+    prov = lokasi.normalise(df, gazetteer.build()).query("level == 'provinsi'")
+    parts.append(pd.DataFrame({"row": prov["row"].to_numpy(), "dim": "provinsi", "value": prov["loc"].astype(object).to_numpy()}))
+    members = pd.concat(parts, ignore_index=True).dropna(subset=["value"]).drop_duplicates()
+    return members.astype({"value": str})
+
+def snapshot_trend(manifest: dict, key: str, ent: dict) -> pd.DataFrame:
+    # Agregat satu snapshot: jumlah lowongan & kuota per nilai, plus churn terhadap snapshot sebelumnya
+    snap = pd.read_parquet(ent["artifacts"]["rows"]).drop_duplicates("_key", keep="last").reset_index(drop=True)
+    diff = pd.read_parquet(ent["diff"]["path"]) if ent.get("diff") else pd.DataFrame(columns=["_key", "status"])
+    m = trend_members(snap)
+    m["jumlah"] = pd.to_numeric(snap["jumlah"], errors="coerce").fillna(0).to_numpy()[m["row"]] if "jumlah" in snap else 0
+    m["added"] = snap["_key"].isin(diff.loc[diff["status"] == "added", "_key"]).to_numpy()[m["row"]]
+    out = m.groupby(["dim", "value"], sort=False).agg(
+        postings=("row", "size"), jumlah=("jumlah", "sum"), added=("added", "sum")
+    )
+    prev_key = (ent.get("diff") or {}).get("prev")
+    removed_keys = diff.loc[diff["status"] == "removed", "_key"]
+    if prev_key and len(removed_keys):
+        prev = pd.read_parquet(manifest["snapshots"][prev_key]["artifacts"]["rows"]).drop_duplicates("_key", keep="last")
+        gone = prev[prev["_key"].isin(removed_keys)].reset_index(drop=True)
+        removed = trend_members(gone).groupby(["dim", "value"], sort=False).size().rename("removed")
+        out = out.join(removed, how="outer")
+    else:
+        out["removed"] = 0
+    out = out.fillna(0).astype("int32").reset_index()
+    out.insert(0, "date", ent["date"])
+    out.insert(0, "snapshot", key)
+    return out
+
+def update_trends(manifest: dict, store_dir: pathlib.Path) -> bool:
+    # Tabel tren lintas snapshot; hanya snapshot baru/berubah (atau yang pendahulunya berubah) yang dihitung
+    state = manifest.setdefault("trends", {})
+    path = store_dir / "trends.parquet"
+    sigs = {
+        key: f"{ent['sha1']}|{(ent.get('diff') or {}).get('prev_sha1')}"
+        for key, ent in chain(manifest) if ent["artifacts"]
+    }
+    applied = state.get("applied", {}) if path.exists() else {}
+    stale = {k for k, v in applied.items() if sigs.get(k) != v}
+    pending = [k for k in sigs if applied.get(k) != sigs[k]]
+    if not pending and not stale:
+        return False
+    old = pd.read_parquet(path) if applied else None
+    if old is not None:
+        old = old[~old["snapshot"].astype(str).isin(stale | set(pending))].astype({"dim": str, "value": str, "snapshot": str})
+    fresh = [snapshot_trend(manifest, k, manifest["snapshots"][k]) for k in pending]
+    trends = pd.concat(([old] if old is not None else []) + fresh, ignore_index=True).sort_values(
+        ["date", "snapshot", "dim", "postings"], ascending=[True, True, True, False], kind="stable"
+    )
+    store_dir.mkdir(parents=True, exist_ok=True)
+    trends.astype({"snapshot": "category", "dim": "category", "value": "category"}).to_parquet(path, index=False)
+    state.update(applied=sigs, path=path.as_posix(), rows=len(trends))
+    return True
+
+def ingest(folders: List[str] = SNAPSHOT_FOLDERS, store_dir: pathlib.Path = STORE_DIR) -> dict:
+    manifest = load_manifest(store_dir)
+    dirty = ingest_snapshots(manifest, folders, store_dir)
+    dirty |= update_diffs(manifest, store_dir)
+    for folder in folders:
+        dirty |= update_current(manifest, pathlib.Path(folder).as_posix(), store_dir)
+    dirty |= update_trends(manifest, store_dir)
+    if dirty or not (store_dir / "catalog_head.json").exists():
+        save_manifest(manifest, store_dir)
+    return manifest
+
+def load_current(folder: str = "data_lowongan", store_dir: pathlib.Path = STORE_DIR, head: dict | None = None) -> pd.DataFrame:
+    # Baca dataset aktif langsung dari artefak di katalog, tanpa ingest
+    head = head or read_head(store_dir)
+    state = head["current"].get(pathlib.Path(folder).as_posix()) if head else None
+    if not state or not state["rows"]:
+        return pd.DataFrame()
+    df = pd.read_parquet(state["artifacts"]["rows"], memory_map=True)
+    tbl = pd.read_parquet(state["artifacts"]["lokasi"], memory_map=True)
+    df["provinsi_list"] = lokasi.to_lists(tbl, len(df), "provinsi")
+    df["kota_list"] = lokasi.to_lists(tbl, len(df), "kota")
+    diff_path = (head["latest"] or {}).get("diff")
+    added = pd.read_parquet(diff_path).query("status == 'added'")["_key"] if diff_path else []
+    df["baru"] = df["_key"].isin(added).to_numpy()
+    df.attrs["snapshot"] = state["snapshot"]
+    return df
+
+# Kolom yang dipakai dashboard; sisanya (lokasi_penempatan, created_at, kategori_posisi, ...) tetap di parquet
+COMPACT_COLS = ["slug", "posisi_magang", "mitra", "provinsi", "kota", "jumlah", "deskripsi"]
+CATEGORY_COLS = ["posisi_magang", "mitra", "provinsi", "kota"]
+
+def load_compact(
+    folder: str = "data_lowongan", store_dir: pathlib.Path = STORE_DIR, head: dict | None = None
+) -> tuple[pd.DataFrame, dict]:
+    # Versi hemat memori untuk dashboard: hanya COMPACT_COLS, string berulang sebagai kategori,
+    # provinsi/kota sebagai lokasi.ListColumn (offset + id) alih-alih kolom list Python
+    head = head or read_head(store_dir)
+    state = head["current"].get(pathlib.Path(folder).as_posix()) if head else None
+    if not state or not state["rows"]:
+        empty = lokasi.ListColumn(np.zeros(1, dtype="int32"), np.empty(0, dtype="int32"), [])
+        df = pd.DataFrame({c: pd.Series(dtype="category" if c in CATEGORY_COLS else object) for c in COMPACT_COLS})
+        return df.assign(jumlah=df["jumlah"].astype("int64"), baru=pd.Series(dtype=bool)), {"provinsi": empty, "kota": empty}
+    df = pd.read_parquet(state["artifacts"]["rows"], columns=[*COMPACT_COLS, "_key"], memory_map=True)
+    tbl = pd.read_parquet(state["artifacts"]["lokasi"], columns=["level", "row", "loc"], memory_map=True)
+    lists = {level: lokasi.ListColumn.from_table(tbl, len(df), level) for level in ("provinsi", "kota")}
+    diff_path = (head["latest"] or {}).get("diff")
+    added = pd.read_parquet(diff_path, columns=["_key", "status"]).query("status == 'added'")["_key"] if diff_path else []
+    df["baru"] = df.pop("_key").isin(added).to_numpy()
+    df = df.astype({c: "category" for c in CATEGORY_COLS})
+    # Kuota kosong = 0 (sum() lama melewati NaN); tanpa ini kolom tetap float dan int(nan) gagal di metrik
+    df["jumlah"] = pd.to_numeric(pd.to_numeric(df["jumlah"], errors="coerce").fillna(0), downcast="integer")
+    df.attrs["snapshot"] = state["snapshot"]
+    df.attrs["rows_path"] = state["artifacts"]["rows"]
+    return df, lists
+
+def load_trends(store_dir: pathlib.Path = STORE_DIR, head: dict | None = None) -> pd.DataFrame:
+    head = head or read_head(store_dir)
+    path = ((head or {}).get("trends") or {}).get("path")
+    if not path or not pathlib.Path(path).exists():
+        return pd.DataFrame(columns=["snapshot", "date", "dim", "value", "postings", "jumlah", "added", "removed"])
+    return pd.read_parquet(path, memory_map=True).astype({"snapshot": str, "dim": str, "value": str})
+
+def load(
+    folder: str = "data_lowongan", store_dir: pathlib.Path = STORE_DIR, folders: List[str] = SNAPSHOT_FOLDERS
+) -> pd.DataFrame:
+    folder = pathlib.Path(folder).as_posix()
+    manifest = ingest(list(dict.fromkeys([*folders, folder])), store_dir)
+    return load_current(folder, store_dir, catalog_head(manifest))
+
+if __name__ == "__main__":
+    from myapp import definisi
+    head = catalog_head(ingest())
+    n_def = definisi.prefetch([t for f in SNAPSHOT_FOLDERS for t in load_current(f).get("posisi_magang", [])])
+    print(f"{n_def} definisi posisi baru di {definisi.CACHE_PATH}")
+    print(json.dumps(head, indent=2, ensure_ascii=False))
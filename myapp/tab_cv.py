@@ -1,117 +1,236 @@
-import pathlib, re, requests, textwrap, hashlib
+import contextlib, hashlib, io, pathlib, re, textwrap, time
+from typing import Iterator
+import numpy as np
+import pandas as pd
 import streamlit as st
+from myapp import definisi, jobs, llm, pipeline, profiling, recommend, search
 
-def show(filtered, api_key):
-    st.subheader("📝 CV Analyzer (Based on AI)")
+CV_SYSTEM = "You are an ATS assistant who evaluates CV fit for internship positions."
+POLL_SECONDS = 1.0
+RE_SKOR = re.compile(r"Skor Kecocokan\W*(\d{1,3})", re.I)
+RE_PROB = re.compile(r"Probabilitas Dipanggil\W*(\d{1,3})\s*%", re.I)
 
-    uploaded = st.file_uploader("Upload CV (PDF/DOCX/TXT)", type=["pdf", "docx", "txt"])
-    lowongan_labels = [
-        f"{row.posisi_magang} @ {row.mitra} (slug:{row.slug})" for _, row in filtered.iterrows()
+def generate_evaluation_cv(prompt: str, model: str, key: str) -> str:
+    messages = [
+        {"role": "system", "content": CV_SYSTEM},
+        {"role": "user", "content": prompt},
     ]
-    selected_label = st.selectbox(
-        "Pilih satu lowongan untuk dianalisis",
-        options=lowongan_labels if lowongan_labels else ["(filter hasil kosong)"],
-        key="sel_low"
-    )
-    model_name = "deepseek/deepseek-r1-0528-qwen3-8b:free"
-    analyze = st.button("🔍 Analyze", disabled=not (uploaded and api_key and lowongan_labels))
+    return llm.chat(messages, model, key)
 
-    def extract_text(file) -> str:
-        ext = pathlib.Path(file.name).suffix.lower()
-        if ext == ".txt":
-            return file.read().decode("utf-8", errors="ignore")
-        if ext == ".pdf":
-            try:
-                import pdfplumber
-                with pdfplumber.open(file) as pdf:
-                    return "\n".join(p.extract_text() or "" for p in pdf.pages)
-            except Exception as e:
-                st.error(f"PDF error: {e}")
-                return ""
-        if ext == ".docx":
-            try:
-                from docx import Document
-                return "\n".join(p.text for p in Document(file).paragraphs)
-            except Exception as e:
-                st.error(f"DOCX error: {e}")
-                return ""
-        return ""
+def stream_evaluation_cv(prompt: str, model: str, key: str, timing: dict) -> Iterator[str]:
+    messages = [
+        {"role": "system", "content": CV_SYSTEM},
+        {"role": "user", "content": prompt},
+    ]
+    # Baris baru jadi hard break markdown, sama seperti tampilan non-streaming
+    for delta in llm.stream_chat(messages, model, key, timing):
+        yield delta.replace("\n", "  \n")
 
-    @st.cache_data(show_spinner=False)
-    def wiki_summary(title: str) -> str:
-        try:
-            resp = requests.get(
-                f"https://en.wikipedia.org/api/rest_v1/page/summary/{title}",
-                timeout=10,
-                headers={"User-Agent": "mbkm-dashboard/1.0"},
-            )
-            if resp.status_code == 200 and resp.json().get("extract"):
-                return resp.json()["extract"]
-        except Exception:
-            pass
+def build_prompt(prompt_cv: str, low_row: pd.Series, basic_def: str, cv_text: str) -> str:
+    return textwrap.dedent(f"""
+    ### INSTRUKSI
+    Anda berperan sebagai *ATS Career Coach* profesional. Evaluasilah kecocokan kandidat
+    untuk lowongan berikut dan berikan panduan pengembangan karier yang terstruktur.""" + prompt_cv + f"""
+    ### Deskripsi Lowongan
+    Posisi : {low_row['posisi_magang']}
+    Mitra  : {low_row['mitra']}
+    {low_row['deskripsi']}
+
+    ### Definisi Posisi
+    {basic_def}
+
+    ### CV Kandidat
+    {cv_text}
+    """)
+
+def cv_skills(rec: recommend.Recommender, cv_text: str) -> tuple[list, list]:
+    # Skill CV = token CV yang ada di kosakata lowongan; bobot tf dibatasi agar CV panjang tidak mendominasi
+    toks = pd.Series(search.index_tokens(cv_text)).value_counts()
+    toks = toks[np.isin(toks.index.to_numpy(dtype=str), rec.vocab)]
+    return toks.index.tolist(), np.minimum(toks.to_numpy(), 3).astype(float).tolist()
+
+def parse_scores(evaluation: str) -> tuple[float, float]:
+    skor, prob = RE_SKOR.search(evaluation), RE_PROB.search(evaluation)
+    return (float(skor.group(1)) if skor else np.nan, float(prob.group(1)) if prob else np.nan)
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def extract_pdf(data: bytes) -> str:
+    import pdfplumber
+    parts = []
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        for page in pdf.pages:
+            parts.append(page.extract_text() or "")
+            # Lepas objek layout halaman ini sebelum lanjut, memori tidak menumpuk per halaman
+            page.close()
+    return "\n".join(parts)
+
+def extract_docx(data: bytes) -> str:
+    from docx import Document
+    return "\n".join(p.text for p in Document(io.BytesIO(data)).paragraphs)
+
+@st.cache_data(show_spinner="Membaca CV…", max_entries=16)
+def extract_text(digest: str, ext: str, _data: bytes) -> str:
+    # Kunci cache = hash isi file; upload ulang/ganti lowongan tidak mengekstrak ulang
+    profiling.count("cv_extract_miss")
+    if ext == ".txt":
+        return _data.decode("utf-8", errors="ignore")
+    if ext == ".pdf":
+        return extract_pdf(_data)
+    if ext == ".docx":
+        return extract_docx(_data)
+    return ""
+
+def read_cv(file) -> str:
+    data, ext = file.getvalue(), pathlib.Path(file.name).suffix.lower()
+    try:
+        with profiling.stage("cv_extract"):
+            return extract_text(content_hash(data), ext, data)
+    except Exception as e:
+        st.error(f"{ext.lstrip('.').upper()} error: {e}")
         return ""
 
-    def generate_evaluation_cv(prompt: str, model: str, key: str) -> str:
-        headers = {"Content-Type": "application/json", "Authorization": f"Bearer {key}"}
-        body = {
-            "model": model,
-            "messages": [
-                {"role": "system", "content": "You are an ATS assistant who evaluates CV fit for internship positions."},
-                {"role": "user", "content": prompt},
-            ],
-        }
-        r = requests.post(
-            "https://openrouter.ai/api/v1/chat/completions",
-            headers=headers,
-            json=body,
-            timeout=90,
+@st.fragment(run_every=POLL_SECONDS)
+def batch_progress(job_ids: list):
+    # Hanya fragmen ini yang dijalankan ulang tiap POLL_SECONDS; selesai semua -> rerun penuh untuk hasil
+    status = jobs.queue().status(job_ids)
+    done, failed, retrying = jobs.progress(status)
+    if done + failed == len(status):
+        st.rerun()
+    ulang = f" · {retrying} menunggu retry (rate limit)" if retrying else ""
+    st.progress((done + failed) / len(status), text=f"Menilai shortlist dengan AI… {done + failed}/{len(status)}{ulang}")
+
+def show_batch(df: pd.DataFrame, state: dict, status: list):
+    shortlist = df.iloc[state["rows"]]
+    evaluations = [j["result"] if j["status"] == "done" else f"Error model: {j['error']}" for j in status]
+    parsed = np.array([parse_scores(e) for e in evaluations]).reshape(-1, 2)
+    hasil = pd.DataFrame({
+        "Posisi": shortlist["posisi_magang"].to_numpy(),
+        "Mitra": shortlist["mitra"].to_numpy(),
+        "Skor Awal": state["skor"],
+        "Skor AI": parsed[:, 0],
+        "Prob. Dipanggil (%)": parsed[:, 1],
+        "Link": pipeline.links(shortlist["slug"]).to_numpy(),
+    })
+    order = hasil.sort_values(["Skor AI", "Skor Awal"], ascending=False, na_position="last").index
+    st.markdown("### 🏆 Peringkat Kecocokan")
+    st.dataframe(
+        hasil.loc[order], hide_index=True, width="stretch",
+        column_config={"Link": st.column_config.LinkColumn("Link", display_text="Link")},
+    )
+    created = [j["created"] for j in status if j.get("created")]
+    finished = [j["finished"] for j in status if j.get("finished")]
+    span = max(finished) - min(created) if created and finished else 0.0
+    st.caption(
+        f"{state['caption']} · AI {len(status)} lowongan {span:.1f} dtk "
+        f"({jobs.PER_KEY_LIMIT} paralel per key, {sum(j.get('attempts', 0) for j in status)} percobaan)"
+    )
+    for i in order:
+        with st.expander(f"📋 {hasil.at[i, 'Posisi']} @ {hasil.at[i, 'Mitra']}"):
+            st.markdown(evaluations[i].replace("\n", "  \n"))
+
+def show(df: pd.DataFrame, rows: np.ndarray, api_key, rec: recommend.Recommender):
+    st.subheader("📝 CV Analyzer (Based on AI)")
+
+    uploaded = st.file_uploader("Upload CV (PDF/DOCX/TXT)", type=["pdf", "docx", "txt"])
+    batch = st.radio(
+        "Mode analisis", ["Satu lowongan", "Cocokkan ke semua lowongan"], horizontal=True, key="cv_mode"
+    ) != "Satu lowongan"
+    model_name = "deepseek/deepseek-r1-0528-qwen3-8b:free"
+    if batch:
+        top_n = st.slider("Jumlah shortlist yang dinilai AI", 3, 15, 5, key="cv_top_n")
+        analyze = st.button("🔍 Cocokkan", disabled=not (uploaded and api_key and len(rows)))
+    else:
+        # Label langsung dari kolom pada posisi hasil filter, tanpa menyalin baris
+        lowongan_labels = [
+            f"{p} @ {m} (slug:{s})"
+            for p, m, s in zip(*(df[c].to_numpy()[rows] for c in ("posisi_magang", "mitra", "slug")))
+        ]
+        selected_label = st.selectbox(
+            "Pilih satu lowongan untuk dianalisis",
+            options=lowongan_labels if lowongan_labels else ["(filter hasil kosong)"],
+            key="sel_low"
         )
-        if r.status_code != 200:
-            raise RuntimeError(r.json())
-        return r.json()["choices"][0]["message"]["content"]
+        analyze = st.button("🔍 Analyze", disabled=not (uploaded and api_key and lowongan_labels))
 
-    def short_hash(text: str) -> str:
-        return hashlib.md5(text.encode()).hexdigest()[:6]
     with open("folder_prompt/cv_analyzer.txt", "r", encoding="utf-8") as f:
         prompt_cv = f.read()
-    if analyze:
+    if analyze and batch:
+        t0 = time.perf_counter()
+        cv_text = read_cv(uploaded)
+        if not cv_text.strip():
+            st.error("Tidak bisa membaca teks CV."); st.stop()
+        t1 = time.perf_counter()
+
+        # Pre-skor lokal: skill CV sekali, lalu satu perkalian BM25 ke semua lowongan hasil filter
+        with profiling.stage("batch_prescore"):
+            skills, weights = cv_skills(rec, cv_text)
+            scores = rec.scores(skills, weights)
+            top = rec.top_k(scores, top_n, rows)
+        t2 = time.perf_counter()
+        if not len(top):
+            st.info("Tidak ada lowongan yang beririsan dengan skill di CV."); st.stop()
+        shortlist = df.iloc[top]
+
+        with profiling.stage("definisi"):
+            prompts = [
+                build_prompt(prompt_cv, row, definisi.lookup(row["posisi_magang"]) or "Definisi tidak ditemukan.", cv_text)
+                for _, row in shortlist.iterrows()
+            ]
+        # Penilaian AI lewat antrean job (batas per API key + retry); sesi hanya menyimpan id job
+        queue = jobs.queue()
+        st.session_state["cv_batch"] = {
+            "snapshot": df.attrs.get("snapshot", ""),
+            "rows": top,
+            "skor": scores[top].round(1),
+            "jobs": [
+                queue.submit(generate_evaluation_cv, p, model_name, api_key, key=api_key, label=label)
+                for p, label in zip(prompts, shortlist["posisi_magang"].astype(str))
+            ],
+            "caption": f"⏱️ Ekstraksi CV {t1 - t0:.2f} dtk · pre-skor {len(rows)} lowongan ({len(skills)} skill) "
+                       f"{(t2 - t1) * 1000:.1f} ms",
+        }
+        profiling.count("llm_jobs", len(prompts))
+
+    elif analyze:
         m = re.search(r"slug:(.*?)\)$", selected_label)
         if not m:
             st.error("Slug lowongan tidak ditemukan."); st.stop()
         sel_slug = m.group(1)
-        low_row = filtered.loc[filtered["slug"] == sel_slug]
-        if low_row.empty:
+        hit = rows[df["slug"].to_numpy()[rows] == sel_slug]
+        if not len(hit):
             st.error("Lowongan tidak tersedia pada filter saat ini."); st.stop()
-        low_row = low_row.iloc[0]
+        low_row = df.iloc[hit[0]]
 
-        cv_text = extract_text(uploaded)
+        cv_text = read_cv(uploaded)
         if not cv_text.strip():
             st.error("Tidak bisa membaca teks CV."); st.stop()
 
-        posisi_title = low_row["posisi_magang"].split()[0]
-        basic_def = wiki_summary(posisi_title) or "Definisi tidak ditemukan."
-        prompt = textwrap.dedent(f"""
-        ### INSTRUKSI
-        Anda berperan sebagai *ATS Career Coach* profesional. Evaluasilah kecocokan kandidat
-        untuk lowongan berikut dan berikan panduan pengembangan karier yang terstruktur.""" + prompt_cv + f"""
-        ### Deskripsi Lowongan
-        Posisi : {low_row['posisi_magang']}
-        Mitra  : {low_row['mitra']}
-        {low_row['deskripsi']}
-
-        ### Definisi Posisi
-        {basic_def}
-
-        ### CV Kandidat
-        {cv_text}
-        """)
-
-        with st.spinner("Meminta penilaian model…"):
+        with profiling.stage("definisi"):
+            basic_def = definisi.lookup(low_row["posisi_magang"]) or "Definisi tidak ditemukan."
+        prompt = build_prompt(prompt_cv, low_row, basic_def, cv_text)
+
+        st.markdown("### 📋 Hasil Evaluasi")
+        timing = {}
+        # Ganti pilihan/klik lain memicu rerun yang memutus script di tengah stream;
+        # closing() memastikan koneksi SSE ikut ditutup (request dibatalkan)
+        with profiling.stage("llm_stream"), contextlib.closing(
+            stream_evaluation_cv(prompt, model_name, api_key, timing)
+        ) as stream:
             try:
-                evaluation = generate_evaluation_cv(prompt, model_name, api_key)
+                st.write_stream(stream)
             except Exception as e:
                 st.error(f"Error model: {e}")
                 st.stop()
+        if "ttft" in timing:
+            sumber = "cache" if timing.get("cached") else model_name
+            st.caption(f"⏱️ Token pertama {timing['ttft']:.2f} dtk · selesai {timing['total']:.2f} dtk ({sumber})")
 
-        st.markdown("### 📋 Hasil Evaluasi")
-        st.markdown(evaluation.replace("\n", "  \n"))
\ No newline at end of file
+    state = st.session_state.get("cv_batch")
+    if batch and state and state["snapshot"] == df.attrs.get("snapshot", ""):
+        status = jobs.queue().status(state["jobs"])
+        if all(j["status"] in jobs.FINISHED for j in status):
+            show_batch(df, state, status)
+        else:
+            batch_progress(state["jobs"])
@@ -1,23 +1,60 @@
-import math, pathlib, re
+import hashlib, io, math, pathlib
 import calendar
 import pandas as pd
 import streamlit as st
+import numpy as np
+from myapp import pipeline, profiling
 
-def show(filtered):
-    folder_path = pathlib.Path("data_lowongan")
-    date_fmt = "%d-%m-%Y"
-    latest_date = None
+SHOW_COLS = ["posisi_magang", "mitra", "provinsi", "kota", "jumlah", "deskripsi"]
+RENAME = {
+    "posisi_magang": "Posisi",
+    "mitra": "Mitra",
+    "provinsi": "Provinsi",
+    "kota": "Kota/Kab",
+    "jumlah": "Divisi",
+    "deskripsi": "Deskripsi",
+}
+ITEMS_PP = 10
 
-    for file in folder_path.glob("data-*.json"):
-        m = re.match(r"data-(\d{2})-(\d{2})-(\d{4})\.json", file.name)
-        if m:
-            d = f"{m.group(1)}-{m.group(2)}-{m.group(3)}"
-            try:
-                dt = pd.to_datetime(d, format=date_fmt)
-                if latest_date is None or dt > latest_date:
-                    latest_date = dt
-            except Exception:
-                pass
+def filter_signature(df: pd.DataFrame, rows: np.ndarray) -> str:
+    h = hashlib.sha1(df.attrs.get("snapshot", "").encode())
+    h.update(np.asarray(rows, dtype="int64").tobytes())
+    return h.hexdigest()
+
+@st.cache_data(show_spinner=False, max_entries=512)
+def render_page(signature: str, page: int, _rows: pd.DataFrame) -> str:
+    # Hanya baris halaman aktif yang diformat; hasil di-cache per signature filter
+    profiling.count("render_page_miss")
+    renamed = _rows[SHOW_COLS].rename(columns=RENAME)
+    renamed["Link"] = pipeline.links(_rows["slug"]).map(lambda x: f'<a href="{x}" target="_blank">Link</a>').to_numpy()
+    return renamed.to_html(classes="custom-table", escape=False, index=False)
+
+def csv_stream(df: pd.DataFrame, rows: np.ndarray, chunk: int = 5000):
+    # Dipanggil saat tombol download diklik, ditulis per potongan baris. Kolom lengkap dibaca dari
+    # parquet versi dataset yang sama (nama file memuat signature); jika versi itu sudah dibuang
+    # atau isinya tidak cocok, ekspor memakai kolom dashboard di memori agar posisi baris tetap benar
+    def build() -> io.BytesIO:
+        path = df.attrs.get("rows_path")
+        src = pd.read_parquet(path) if path and pathlib.Path(path).exists() else df
+        if len(src) != len(df):
+            src = df
+        cols = [c for c in src.columns if not c.startswith("_")]
+        buf = io.BytesIO()
+        with profiling.event("csv"):
+            for i in range(0, max(len(rows), 1), chunk):
+                part = src.iloc[rows[i:i + chunk]][cols].assign(baru=df["baru"].to_numpy()[rows[i:i + chunk]])
+                part["Link"] = pipeline.links(part["slug"]).to_numpy()
+                buf.write(part.to_csv(index=False, header=(i == 0)).encode("utf-8"))
+        buf.seek(0)
+        return buf
+    return build
+
+def set_page(delta: int):
+    st.session_state.page += delta
+
+def show(df: pd.DataFrame, rows: np.ndarray, latest=None):
+    # rows: posisi baris hasil filter; dataset bersama tidak pernah disalin utuh
+    latest_date = pd.to_datetime(latest["date"]) if latest else None
 
     if latest_date:
         day = latest_date.day
@@ -35,6 +72,7 @@ def show(filtered):
             color: #ddd;
         ">
             📅 <strong>Terakhir update pada tanggal:</strong> {formatted}
+            &nbsp;·&nbsp; 🆕 <strong>{int(df["baru"].to_numpy()[rows].sum())}</strong> lowongan baru sejak snapshot sebelumnya
         </div>
         """, unsafe_allow_html=True)
     else:
@@ -50,19 +88,6 @@ def show(filtered):
             ⚠️ <strong>Data belum tersedia.</strong> Silakan klik tombol update terlebih dahulu.
         </div>
         """, unsafe_allow_html=True)
-    show_cols = ["posisi_magang", "mitra", "provinsi", "kota", "jumlah", "deskripsi", "Link"]
-    renamed = filtered[show_cols].rename(
-        columns={
-            "posisi_magang": "Posisi",
-            "mitra": "Mitra",
-            "provinsi": "Provinsi",
-            "kota": "Kota/Kab",
-            "jumlah": "Divisi",
-            "deskripsi": "Deskripsi",
-        }
-    )
-    renamed["Link"] = renamed["Link"].apply(lambda x: f'<a href="{x}" target="_blank">Link</a>')
-
     # --- Style ---
     st.markdown(
         """
@@ -85,8 +110,8 @@ def show(filtered):
         """,
         unsafe_allow_html=True,
     )
-    items_pp = 10
-    total_pages = max(1, math.ceil(len(renamed) / items_pp))
+    total_rows = len(rows)
+    total_pages = max(1, math.ceil(total_rows / ITEMS_PP))
 
     if "page" not in st.session_state:
         st.session_state.page = 1
@@ -97,29 +122,28 @@ def show(filtered):
         st.session_state.page = 1
 
     page = st.session_state.page
-    start, end = (page - 1) * items_pp, page * items_pp
+    start, end = (page - 1) * ITEMS_PP, page * ITEMS_PP
 
-    table_html = renamed.iloc[start:end].to_html(classes="custom-table", escape=False, index=False)
+    with profiling.stage("render_page"):
+        table_html = render_page(filter_signature(df, rows), page, df.iloc[rows[start:end]])
     st.markdown(f'<div class="table-container">{table_html}</div>', unsafe_allow_html=True)
 
     gap, info_prev, next_col = st.columns([2, 0.15, 0.15])
 
     with info_prev:
-        if st.button("⬅️ Prev", disabled=(page == 1)):
-            st.session_state.page -= 1
+        st.button("⬅️ Prev", disabled=(page == 1), on_click=set_page, args=(-1,))
     
     info_prev.markdown(
-        f"<div style='display:flex;justify-content:flex-end;align-items:center;width:100%;font-size:15px;white-space:nowrap; padding-left: 180px;'>Halaman {page} dari {total_pages} ({len(renamed)} total data)</div>",
+        f"<div style='display:flex;justify-content:flex-end;align-items:center;width:100%;font-size:15px;white-space:nowrap; padding-left: 180px;'>Halaman {page} dari {total_pages} ({total_rows} total data)</div>",
         unsafe_allow_html=True
     )
     
     with next_col:
-        if st.button("Next ➡️", disabled=(page == total_pages)):
-            st.session_state.page += 1
+        st.button("Next ➡️", disabled=(page == total_pages), on_click=set_page, args=(1,))
 
     st.download_button(
         "⬇️ Download CSV (hasil filter)",
-        filtered.to_csv(index=False).encode("utf-8"),
+        csv_stream(df, rows),
         "lowongan_filtered.csv",
         "text/csv",
     )
\ No newline at end of file
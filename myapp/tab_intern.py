@@ -1,91 +1,103 @@
-import re
+import re, time
+import numpy as np
 import streamlit as st
-import requests
+import pandas as pd
+from myapp import jobs, llm, pipeline, profiling, recommend
 
-def show(filtered, api_key, model_name="deepseek/deepseek-r1-0528-qwen3-8b:free"):
-    st.subheader("📊 Pencarian Berdasarkan Posisi")
-    st.warning("Fitur ini masih dalam tahap pengembangan. Hasil mungkin tidak akurat dan tidak sesuai harapan.  ")
-    posisi = st.text_input("Ingin magang posisi apa?", placeholder="mis. Data Analyst, Marketing, dll")
-    
-    def count_keyword_matches(text, keywords):
-        return sum(kw.lower() in text.lower() for kw in keywords)
+INTERN_SYSTEM = "You are an AI assistant that helps users find relevant internship positions based on specific job roles."
 
-    def generate_evaluation_intern(prompt: str, model: str, key: str) -> str:
-        headers = {"Content-Type": "application/json", "Authorization": f"Bearer {key}"}
-        body = {
-            "model": model,
-            "messages": [
-                {"role": "system", "content": "You are an AI assistant that helps users find relevant internship positions based on specific job roles."},
-                {"role": "user", "content": prompt},
-            ],
-        }
-        
-        r = requests.post(
-            "https://openrouter.ai/api/v1/chat/completions",
-            headers=headers,
-            json=body,
-            timeout=90,
-        )
+def generate_evaluation_intern(prompt: str, model: str, key: str) -> str:
+    messages = [
+        {"role": "system", "content": INTERN_SYSTEM},
+        {"role": "user", "content": prompt},
+    ]
+    return llm.chat(messages, model, key)
 
-        if r.status_code != 200:
-            raise RuntimeError(r.json())
-        return r.json()["choices"][0]["message"]["content"]
+def ai_keywords(posisi: str, model_name: str, api_key: str) -> list:
+    prompt_keywords = f"""
+    Kamu adalah asisten karier yang membantu dalam pencarian magang. Tugasmu adalah memberikan 10 - 25 kata kunci spesifik (dalam bahasa Indonesia) yang paling relevan untuk posisi magang dengan posisi: "{posisi}"
 
-    if posisi:
-        with st.spinner("🔍 Mencari magang dengan kata kunci yang relevan..."):
-            prompt_keywords = f"""
-            Kamu adalah asisten karier yang membantu dalam pencarian magang. Tugasmu adalah memberikan 10 - 25 kata kunci spesifik (dalam bahasa Indonesia) yang paling relevan untuk posisi magang dengan posisi: "{posisi}"
+    Langkah-langkah:
+    1. Pahami maksud dari posisi tersebut: apakah ini sebuah jabatan spesifik atau bidang umum.
+    2. Jika "{posisi}" merupakan jabatan spesifik, sertakan posisinya sebagai salah satu kata kunci.
+    3. Jika itu bidang umum, fokus pada keterampilan atau tools yang relevan.
+    4. Hindari kata umum seperti "magang", "kerja", "digital", atau nama bidang generik seperti "TI", "bisnis".
+    5. Fokus pada tools, keterampilan, platform, metode, atau istilah teknis yang relevan.
+
+    **Hasilkan hanya daftar kata kunci, tanpa penjelasan tambahan.**
+    """
+    keywords_resp = generate_evaluation_intern(prompt_keywords, model_name, api_key)
+    # Pisahkan berdasarkan koma atau baris baru, lalu bersihkan spasi
+    return [k.strip() for k in re.split(r"[,\n]+", keywords_resp) if k.strip()]
+
+POLL_SECONDS = 1.0
 
-            Langkah-langkah:
-            1. Pahami maksud dari posisi tersebut: apakah ini sebuah jabatan spesifik atau bidang umum.
-            2. Jika "{posisi}" merupakan jabatan spesifik, sertakan posisinya sebagai salah satu kata kunci.
-            3. Jika itu bidang umum, fokus pada keterampilan atau tools yang relevan.
-            4. Hindari kata umum seperti "magang", "kerja", "digital", atau nama bidang generik seperti "TI", "bisnis".
-            5. Fokus pada tools, keterampilan, platform, metode, atau istilah teknis yang relevan.
+@st.fragment(run_every=POLL_SECONDS)
+def keyword_progress(job_id: str):
+    job = jobs.queue().status([job_id])[0]
+    if job["status"] in jobs.FINISHED:
+        st.rerun()
+    ulang = " (rate limit, dicoba lagi)" if job["status"] == "retrying" else ""
+    st.caption(f"🔍 Meminta kata kunci yang relevan ke AI…{ulang} Peringkat lokal ditampilkan dulu.")
 
-            **Hasilkan hanya daftar kata kunci, tanpa penjelasan tambahan.**
-            """
-            try:
-                keywords_resp = generate_evaluation_intern(prompt_keywords, model_name, api_key)
-                # Pisahkan berdasarkan koma atau baris baru, lalu bersihkan spasi
-                keywords = [k.strip() for k in re.split(r"[,\n]+", keywords_resp) if k.strip()]
-            except Exception as e:
-                st.error(f"❌ Gagal mendapatkan kata kunci dari AI: {e}")
-                keywords = []
-            
-        if keywords:
-            st.markdown(f"**Kata kunci hasil AI:** `{', '.join(keywords)}`")
+def keyword_job(posisi: str, model_name: str, api_key: str) -> list:
+    # Kata kunci AI lewat antrean job; selama belum selesai peringkat lokal tampil tanpa rerank.
+    # Job baru jika posisi/model/API key berubah, job sudah dibuang dari antrean, atau gagal
+    # dan kegagalannya sudah ditampilkan sekali (rerun berikutnya = coba lagi)
+    queue = jobs.queue()
+    ident = (posisi, model_name, jobs.key_id(api_key))
+    state = st.session_state.get("intern_keywords")
+    job = queue.status([state["job"]])[0] if state and state["ident"] == ident else None
+    if job is None or "created" not in job or (job["status"] == "failed" and state.get("reported")):
+        job_id = queue.submit(ai_keywords, posisi, model_name, api_key, key=api_key, label=posisi)
+        state = st.session_state["intern_keywords"] = {"ident": ident, "job": job_id}
+        job = queue.status([job_id])[0]
+        profiling.count("llm_jobs")
+    if job["status"] == "done":
+        return job["result"]
+    if job["status"] == "failed":
+        state["reported"] = True
+        st.error(f"❌ Gagal mendapatkan kata kunci dari AI: {job['error']}")
+    else:
+        keyword_progress(state["job"])
+    return []
 
-            st.info("🔎 Mencari lowongan magang yang relevan dengan kata kunci tersebut...")
-            pattern = "|".join(map(re.escape, keywords))
-            mask = (
-                filtered["deskripsi"].str.contains(pattern, case=False, na=False) |
-                filtered["posisi_magang"].str.contains(pattern, case=False, na=False)
-            )
-            hasil_rekom = filtered[mask].copy()
+def show(df: pd.DataFrame, rows: np.ndarray, api_key, rec: recommend.Recommender, model_name="deepseek/deepseek-r1-0528-qwen3-8b:free"):
+    st.subheader("📊 Pencarian Berdasarkan Posisi")
+    st.warning("Fitur ini masih dalam tahap pengembangan. Hasil mungkin tidak akurat dan tidak sesuai harapan.  ")
+    posisi = st.text_input("Ingin magang posisi apa?", placeholder="mis. Data Analyst, Marketing, dll")
+    rerank = st.checkbox(
+        "✨ Perluas dengan kata kunci AI (rerank)", value=False, disabled=not api_key,
+        help="Butuh API key. Peringkat awal tetap dihitung lokal; kata kunci AI hanya menata ulang hasil teratas.",
+    )
+
+    if posisi:
+        keywords = []
+        if rerank:
+            keywords = keyword_job(posisi, model_name, api_key)
+            if keywords:
+                st.markdown(f"**Kata kunci hasil AI:** `{', '.join(keywords)}`")
 
-            hasil_rekom["relevansi"] = (
-                hasil_rekom["deskripsi"].fillna("").apply(lambda x: count_keyword_matches(x, keywords)) +
-                hasil_rekom["posisi_magang"].fillna("").apply(lambda x: count_keyword_matches(x, keywords))
-            )
-            hasil_rekom = hasil_rekom.sort_values(by="relevansi", ascending=False)
-            hasil_rekom = hasil_rekom.head(20).copy()
+        # rows = posisi baris hasil filter di dataset bersama
+        t0 = time.perf_counter()
+        with profiling.stage("rank"):
+            top = recommend.rank(rec, posisi, rows, keywords)
+        st.caption(f"⏱️ Peringkat {len(rows)} lowongan dalam {(time.perf_counter() - t0) * 1000:.1f} ms")
+        hasil_rekom = df.iloc[top]
 
-            if hasil_rekom.empty:
-                st.info("🔎 Tidak ditemukan lowongan magang yang cocok dengan kata kunci tersebut.")
-            else:
-                st.markdown("### ✅ Rekomendasi Lowongan Magang:")
-                show_cols = ["posisi_magang", "mitra", "provinsi", "kota", "jumlah", "deskripsi", "Link"]
-                renamed = hasil_rekom[show_cols].rename(columns={
-                    "posisi_magang": "Posisi",
-                    "mitra": "Mitra",
-                    "provinsi": "Provinsi",
-                    "kota": "Kota/Kab",
-                    "jumlah": "Divisi",
-                    "deskripsi": "Deskripsi"
-                })
-                renamed["Link"] = renamed["Link"].apply(lambda x: f'<a href="{x}" target="_blank">Link</a>')
-                table_html = renamed.to_html(classes="custom-table", escape=False, index=False)
-                st.markdown(f'<div class="table-container">{table_html}</div>', unsafe_allow_html=True)
+        if hasil_rekom.empty:
+            st.info("🔎 Tidak ditemukan lowongan magang yang cocok dengan posisi tersebut.")
         else:
-            st.warning("⚠️ Tidak ada kata kunci yang berhasil dihasilkan.")
\ No newline at end of file
+            st.markdown("### ✅ Rekomendasi Lowongan Magang:")
+            show_cols = ["posisi_magang", "mitra", "provinsi", "kota", "jumlah", "deskripsi"]
+            renamed = hasil_rekom[show_cols].rename(columns={
+                "posisi_magang": "Posisi",
+                "mitra": "Mitra",
+                "provinsi": "Provinsi",
+                "kota": "Kota/Kab",
+                "jumlah": "Divisi",
+                "deskripsi": "Deskripsi"
+            })
+            renamed["Link"] = pipeline.links(hasil_rekom["slug"]).map(lambda x: f'<a href="{x}" target="_blank">Link</a>').to_numpy()
+            table_html = renamed.to_html(classes="custom-table", escape=False, index=False)
+            st.markdown(f'<div class="table-container">{table_html}</div>', unsafe_allow_html=True)
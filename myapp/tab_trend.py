@@ -0,0 +1,56 @@
+import pandas as pd
+import streamlit as st
+import plotly.express as px
+
+DIMENSI = {"Mitra": "mitra", "Provinsi": "provinsi", "Posisi": "posisi"}
+TOP_N = 10
+
+def show(trends: pd.DataFrame):
+    st.subheader("📉 Tren Antar Snapshot")
+    if trends.empty:
+        st.info("Belum ada data tren. Jalankan scraper atau `python -m myapp.store` untuk membangun tabel tren.")
+        return
+
+    total = trends[trends["dim"] == "semua"].sort_values("date")
+    if len(total) < 2:
+        st.info("Baru ada satu snapshot; tren akan muncul setelah snapshot berikutnya masuk.")
+
+    tot1, tot2 = st.columns(2)
+    tot1.plotly_chart(
+        px.line(total, x="date", y=["postings", "jumlah"], markers=True,
+                labels={"date": "Tanggal", "value": "Jumlah", "variable": ""}),
+        width="stretch",
+    )
+    # Snapshot pertama tidak punya pembanding: semua barisnya tercatat "dibuka", jadi dikeluarkan dari churn
+    awal = total["date"].min()
+    churn = total[total["date"] > awal].melt(
+        id_vars="date", value_vars=["added", "removed"], var_name="Status", value_name="Lowongan"
+    )
+    churn["Status"] = churn["Status"].map({"added": "Dibuka", "removed": "Ditutup"})
+    tot2.plotly_chart(
+        px.bar(churn, x="date", y="Lowongan", color="Status", barmode="group", labels={"date": "Tanggal"}),
+        width="stretch",
+    )
+
+    label = st.radio("Dimensi", list(DIMENSI), horizontal=True, key="trend_dim")
+    ukuran = st.radio("Ukuran", ["Lowongan", "Kuota (jumlah)"], horizontal=True, key="trend_ukuran")
+    col = "postings" if ukuran == "Lowongan" else "jumlah"
+    sub = trends[trends["dim"] == DIMENSI[label]]
+    # Nilai teratas menurut snapshot terakhir, lalu ditelusuri ke belakang
+    latest = sub[sub["date"] == sub["date"].max()].nlargest(TOP_N, col)["value"]
+    lines = sub[sub["value"].isin(latest)].sort_values("date")
+    st.plotly_chart(
+        px.line(lines, x="date", y=col, color="value", markers=True,
+                labels={"date": "Tanggal", col: ukuran, "value": label}),
+        width="stretch",
+    )
+
+    perubahan = (
+        sub[sub["date"] > awal].groupby("value", observed=True)[["added", "removed"]].sum()
+        .assign(neto=lambda d: d["added"] - d["removed"])
+        .sort_values("neto", ascending=False)
+        .rename(columns={"added": "Dibuka", "removed": "Ditutup", "neto": "Neto"})
+        .rename_axis(label)
+    )
+    st.markdown(f"**Churn per {label.lower()} (sejak snapshot kedua)**")
+    st.dataframe(perubahan.head(20), width="stretch")
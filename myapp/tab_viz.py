@@ -2,19 +2,19 @@ import pandas as pd
 import numpy as np
 import streamlit as st
 import plotly.express as px
+from myapp import cubes, profiling
 
-def show(filtered):
+def top_frame(cube: cubes.Cube, mask: np.ndarray, col: str) -> pd.DataFrame:
+    # Top-10 dari cube + mask filter, bentuk sama dengan value_counts().reset_index()
+    with profiling.stage("viz_aggregate"):
+        return cube.top(mask).rename_axis(col).reset_index(name="Jumlah")
+
+def show(cube_idx: dict, mask: np.ndarray):
     st.subheader("📍 Statistik Lokasi")
     loc1, loc2 = st.columns(2)
 
-    prov_count = (
-        filtered["provinsi_list"].explode().value_counts().head(10).reset_index(name="Jumlah")
-        .rename(columns={"index": "Provinsi"})
-    )
-    kota_count = (
-        filtered["kota_list"].explode().value_counts().head(10).reset_index(name="Jumlah")
-        .rename(columns={"index": "Kota"})
-    )
+    prov_count = top_frame(cube_idx["provinsi"], mask, "provinsi_list")
+    kota_count = top_frame(cube_idx["kota"], mask, "kota_list")
 
     loc1.plotly_chart(px.bar(prov_count, x="Jumlah", y="provinsi_list", orientation="h"), use_container_width=True)
     loc2.plotly_chart(px.bar(kota_count, x="Jumlah", y="kota_list", orientation="h"), use_container_width=True)
@@ -22,14 +22,8 @@ def show(filtered):
     st.subheader("💼 Statistik Posisi & Mitra")
     pos1, pos2 = st.columns(2)
 
-    pos_count = (
-        filtered["posisi_magang"].value_counts().head(10).reset_index(name="Jumlah")
-        .rename(columns={"index": "Posisi"})
-    )
-    mitra_count = (
-        filtered["mitra"].value_counts().head(10).reset_index(name="Jumlah")
-        .rename(columns={"index": "Mitra"})
-    )
+    pos_count = top_frame(cube_idx["posisi"], mask, "posisi_magang")
+    mitra_count = top_frame(cube_idx["mitra"], mask, "mitra")
 
     pos1.plotly_chart(px.bar(pos_count, x="Jumlah", y="posisi_magang", orientation="h"), use_container_width=True)
     pos2.plotly_chart(px.bar(mitra_count, x="Jumlah", y="mitra", orientation="h"), use_container_width=True)
@@ -1,35 +1,54 @@
-from bs4 import BeautifulSoup
-import json
+import argparse, json, os, pathlib
 from datetime import datetime
-import os
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
-import time
-
-# --- Scrape halaman ---
-options = webdriver.ChromeOptions()
-options.add_argument('--headless')
-options.add_argument('--no-sandbox')
-driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-driver.get("https://simbelmawa.kemdikbud.go.id/magang/lowongan?bidang=&cari=&page=1&perPage=1000")
-time.sleep(5)
-
-# --- Ambil elemen #app dan data-page-nya ---
-app_html = driver.find_element(By.ID, "app").get_attribute("outerHTML")
-driver.quit()
-
-# --- Parsing dan simpan ---
-soup = BeautifulSoup(app_html, "html.parser")
-data_page_raw = soup.select_one("#app")["data-page"]
-parsed_data = json.loads(data_page_raw)
-
-today_str = datetime.now().strftime("%d-%m-%Y")
-filename = f"data-{today_str}.json"
-os.makedirs("data_lowongan", exist_ok=True)
-
-with open(f"data_lowongan/{filename}", "w", encoding="utf-8") as f:
-    json.dump(parsed_data, f, ensure_ascii=False, indent=2)
-
-print(f"✅ Berhasil simpan data ke data_lowongan/{filename}")
+from myapp import definisi, fetcher, store
+
+def scrape_selenium(url: str) -> dict:
+    # Mode lama: render halaman penuh dengan headless Chrome
+    from bs4 import BeautifulSoup
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.common.by import By
+    from webdriver_manager.chrome import ChromeDriverManager
+    import time
+
+    # --- Scrape halaman ---
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    driver.get(url)
+    time.sleep(5)
+
+    # --- Ambil elemen #app dan data-page-nya ---
+    app_html = driver.find_element(By.ID, "app").get_attribute("outerHTML")
+    driver.quit()
+
+    soup = BeautifulSoup(app_html, "html.parser")
+    return json.loads(soup.select_one("#app")["data-page"])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", choices=["http", "selenium"], default="http")
+    parser.add_argument("--base-url", default=fetcher.BASE_URL)
+    parser.add_argument("--per-page", type=int, default=fetcher.PER_PAGE)
+    parser.add_argument("--workers", type=int, default=fetcher.MAX_WORKERS)
+    parser.add_argument("--out-dir", default="data_lowongan")
+    args = parser.parse_args()
+
+    today_str = datetime.now().strftime("%d-%m-%Y")
+    path = pathlib.Path(args.out_dir) / f"data-{today_str}.json"
+
+    # --- Ambil dan simpan ---
+    if args.mode == "selenium":
+        parsed_data = scrape_selenium(f"{args.base_url}?bidang=&cari=&page=1&perPage=1000")
+        os.makedirs(args.out_dir, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(parsed_data, f, ensure_ascii=False, indent=2)
+        total = len(parsed_data["props"]["data"]["data"])
+    else:
+        total = fetcher.write_snapshot(fetcher.iter_pages(args.base_url, args.per_page, args.workers), path)
+
+    store.ingest(list(dict.fromkeys([*store.SNAPSHOT_FOLDERS, args.out_dir])))
+    n_def = definisi.prefetch(store.load_current(args.out_dir).get("posisi_magang", []))
+    print(f"📚 {n_def} definisi posisi baru disimpan ke {definisi.CACHE_PATH}")
+    print(f"✅ Berhasil simpan {total} lowongan ke {path}")
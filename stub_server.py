@@ -0,0 +1,152 @@
+import argparse, copy, html, json, math, random, re, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+# Server lokal untuk uji scraper & klien LLM tanpa internet:
+#   python stub_server.py --port 8765 --llm-delay 2
+#   python scrape.py --base-url http://127.0.0.1:8765/magang/lowongan --per-page 50
+#   OPENROUTER_BASE_URL=http://127.0.0.1:8765/api/v1 streamlit run curl.py
+#   python stub_server.py --key-limit 2 --fail-rate 0.2   # uji antrean job: 429 per key + 503 acak
+
+with open("lowongan.json", "r", encoding="utf-8") as f:
+    PAGE = json.load(f)
+with open("app_content.html", "r", encoding="utf-8") as f:
+    APP_HTML = f.read()
+ROWS = PAGE["props"]["data"]["data"]
+LLM_DELAY = 1.0
+KEY_LIMIT = 0       # >0: request bersamaan per API key di atas batas ini dijawab 429
+FAIL_RATE = 0.0     # peluang request non-stream dijawab 503
+INVALID_KEY = "sk-invalid"  # key ini selalu dijawab 401 (error yang tidak boleh di-retry)
+CURSOR_ONLY = False # True: tanpa last_page, klien harus mengikuti next_page_url
+STATS = {"chat": 0, "cancelled": 0, "rate_limited": 0, "failed": 0, "peak": 0}
+STATS_LOCK = threading.Lock()
+ACTIVE: dict[str, int] = {}
+
+def stub_reply(body: dict) -> str:
+    prompt = body["messages"][-1]["content"]
+    return f"[stub {body.get('model')}] {len(prompt.split())} kata diterima.\n\nRingkasan  \nJawaban dummy dari stub server."
+
+def paginate(base: str, page: int, per_page: int) -> dict:
+    obj = copy.deepcopy(PAGE)
+    last = max(1, math.ceil(len(ROWS) / per_page))
+    url = lambda p: f"{base}?{urlencode({'perPage': per_page, 'page': p})}" if 1 <= p <= last else None
+    start = (page - 1) * per_page
+    obj["props"]["data"].update(
+        current_page=page,
+        data=ROWS[start:start + per_page],
+        first_page_url=url(1),
+        last_page=last,
+        last_page_url=url(last),
+        next_page_url=url(page + 1),
+        prev_page_url=url(page - 1),
+        per_page=per_page,
+        total=len(ROWS),
+        **{"from": start + 1, "to": min(start + per_page, len(ROWS))},
+    )
+    if CURSOR_ONLY:
+        obj["props"]["data"].update(last_page=None, last_page_url=None)
+    return obj
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def send(self, status: int, body: bytes, content_type: str, extra: dict | None = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (extra or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/stats":
+            return self.send(200, json.dumps(STATS).encode(), "application/json")
+        if not url.path.rstrip("/").endswith("/magang/lowongan"):
+            return self.send(404, b"not found", "text/plain")
+        qs = parse_qs(url.query)
+        page = int(qs.get("page", ["1"])[0])
+        per_page = int(qs.get("perPage", ["1000"])[0])
+        obj = paginate(f"http://{self.headers['Host']}{url.path}", page, per_page)
+        if self.headers.get("X-Inertia"):
+            if self.headers.get("X-Inertia-Version", PAGE["version"]) != PAGE["version"]:
+                return self.send(409, b"", "text/plain", {"X-Inertia-Location": self.path})
+            return self.send(200, json.dumps(obj).encode(), "application/json", {"X-Inertia": "true"})
+        data_page = html.escape(json.dumps(obj), quote=True)
+        body = re.sub(r"data-page='[^']*'", lambda _: f"data-page='{data_page}'", APP_HTML, count=1)
+        self.send(200, body.encode(), "text/html; charset=utf-8")
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if not url.path.endswith("/chat/completions"):
+            return self.send(404, b"not found", "text/plain")
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        key = self.headers.get("Authorization", "")
+        with STATS_LOCK:
+            STATS["chat"] += 1
+        if key == f"Bearer {INVALID_KEY}":
+            error = {"error": {"code": 401, "message": "No auth credentials found"}}
+            return self.send(401, json.dumps(error).encode(), "application/json")
+        with STATS_LOCK:
+            if KEY_LIMIT and ACTIVE.get(key, 0) >= KEY_LIMIT:
+                STATS["rate_limited"] += 1
+                limited = True
+            else:
+                limited = False
+                ACTIVE[key] = ACTIVE.get(key, 0) + 1
+                STATS["peak"] = max(STATS["peak"], ACTIVE[key])
+        if limited:
+            error = {"error": {"code": 429, "message": "Rate limit exceeded"}}
+            return self.send(429, json.dumps(error).encode(), "application/json", {"Retry-After": "1"})
+        try:
+            if body.get("stream"):
+                return self.stream(body)
+            time.sleep(LLM_DELAY)
+            if random.random() < FAIL_RATE:
+                with STATS_LOCK:
+                    STATS["failed"] += 1
+                return self.send(503, b'{"error": {"code": 503, "message": "upstream unavailable"}}', "application/json")
+            reply = {"choices": [{"message": {"role": "assistant", "content": stub_reply(body)}}]}
+            self.send(200, json.dumps(reply).encode(), "application/json")
+        finally:
+            with STATS_LOCK:
+                ACTIVE[key] -= 1
+
+    def stream(self, body: dict):
+        # SSE ala OpenRouter: komentar keep-alive, delta per kata, lalu [DONE]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            self.wfile.write(b": OPENROUTER PROCESSING\n\n")
+            self.wfile.flush()
+            time.sleep(LLM_DELAY / 2)
+            for word in re.findall(r"\S+\s*", stub_reply(body)):
+                chunk = {"choices": [{"index": 0, "delta": {"content": word}}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+                time.sleep(LLM_DELAY / 20)
+            self.wfile.write(b"data: [DONE]\n\n")
+        except (BrokenPipeError, ConnectionResetError):
+            with STATS_LOCK:
+                STATS["cancelled"] += 1
+
+    def log_message(self, fmt, *args):
+        pass
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--llm-delay", type=float, default=LLM_DELAY)
+    parser.add_argument("--key-limit", type=int, default=KEY_LIMIT)
+    parser.add_argument("--fail-rate", type=float, default=FAIL_RATE)
+    parser.add_argument("--cursor-only", action="store_true")
+    args = parser.parse_args()
+    LLM_DELAY, KEY_LIMIT, FAIL_RATE, CURSOR_ONLY = args.llm_delay, args.key_limit, args.fail_rate, args.cursor_only
+    print(f"Stub server di http://{args.host}:{args.port}")
+    ThreadingHTTPServer((args.host, args.port), Handler).serve_forever()
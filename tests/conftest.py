@@ -0,0 +1,43 @@
+import copy, json, pathlib, sys
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+@pytest.fixture(autouse=True)
+def repo_cwd(monkeypatch):
+    # Path relatif (wilayah_id.txt, definisi_posisi.json, lowongan.json) dibaca dari root repo
+    monkeypatch.chdir(ROOT)
+
+@pytest.fixture
+def template_rows() -> list:
+    with open(ROOT / "lowongan.json", "r", encoding="utf-8") as f:
+        return json.load(f)["props"]["data"]["data"]
+
+def write_snapshot(folder: pathlib.Path, date: str, rows: list) -> pathlib.Path:
+    # date = "DD-MM-YYYY" (pola nama file scraper)
+    folder.mkdir(parents=True, exist_ok=True)
+    path = folder / f"data-{date}.json"
+    path.write_text(json.dumps({"props": {"data": {"data": rows}}}), encoding="utf-8")
+    return path
+
+def posting(template: dict, i: int, **fields) -> dict:
+    row = copy.deepcopy(template)
+    row.update(id_lowongan=i, slug=f"lowongan-{i}", **fields)
+    return row
+
+@pytest.fixture
+def stub(monkeypatch):
+    # stub_server.py di port acak, satu thread; atribut modul (LLM_DELAY, KEY_LIMIT, ...) bisa di-monkeypatch per test
+    monkeypatch.chdir(ROOT)
+    import threading
+    from http.server import ThreadingHTTPServer
+    import stub_server
+    monkeypatch.setattr(stub_server, "LLM_DELAY", 0.05)
+    monkeypatch.setattr(stub_server, "STATS", {k: 0 for k in stub_server.STATS})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), stub_server.Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield stub_server, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,27 @@
+import pytest
+from starlette.datastructures import QueryParams
+import api
+from myapp import pipeline, store
+from conftest import ROOT, write_snapshot
+
+@pytest.fixture
+def pipe(tmp_path, monkeypatch, template_rows):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "wilayah_id.txt").symlink_to(ROOT / "wilayah_id.txt")
+    write_snapshot(tmp_path / "data_lowongan", "01-07-2025", template_rows)
+    return pipeline.Pipeline(store.catalog_head(store.ingest(["data_lowongan"])))
+
+def test_facet_values_round_trip_from_items(pipe):
+    # Nilai di lokasi.kota item bisa langsung dipakai sebagai filter kota
+    item = next(i for i in api.lowongan(pipe, QueryParams("per_page=200"))["items"] if i["lokasi"]["kota"])
+    kota = item["lokasi"]["kota"][0]
+    page = api.lowongan(pipe, QueryParams({"kota": kota, "per_page": "200"}))
+    assert page["total"] > 0 and all(kota in i["lokasi"]["kota"] for i in page["items"])
+
+def test_unknown_facet_value_is_rejected_with_options(pipe):
+    kota = next(o for o in pipe.facets["kota"].options if o.startswith("Kota "))
+    raw = kota.split(" ", 1)[-1]
+    with pytest.raises(ValueError, match=f"nilai kota tidak dikenal: {raw}.*{kota}"):
+        api.lowongan(pipe, QueryParams({"kota": raw}))
+    with pytest.raises(ValueError, match="nilai mitra tidak dikenal"):
+        api.facet_counts(pipe, QueryParams({"mitra": "PT Tidak Ada"}))
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+from myapp import cubes, lokasi
+
+def sample(n: int = 300, seed: int = 0) -> tuple[pd.DataFrame, lokasi.ListColumn]:
+    rng = np.random.default_rng(seed)
+    kota = [list(rng.choice(["Kota A", "Kota B", "Kota C", "Kota D"], size=rng.integers(0, 3), replace=False))
+            for _ in range(n)]
+    df = pd.DataFrame({
+        "mitra": rng.choice(["PT X", "PT Y", "PT Z", None], size=n),
+        "posisi_magang": pd.Series(rng.choice(["Analyst", "Developer", "Designer"], size=n), dtype="category"),
+        "jumlah": rng.integers(1, 10, size=n).astype(float),
+        "kota_list": kota,
+    })
+    df.loc[::7, "jumlah"] = np.nan
+    return df, lokasi.ListColumn.from_lists(df["kota_list"])
+
+def test_top_matches_value_counts_under_masks():
+    df, kota = sample()
+    cube_kota, cube_mitra = cubes.list_cube(kota), cubes.single_cube(df["mitra"])
+    cube_posisi = cubes.single_cube(df["posisi_magang"])
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        mask = rng.random(len(df)) < rng.random()
+        sub = df[mask]
+        pd.testing.assert_series_equal(
+            cube_kota.top(mask), sub["kota_list"].explode().dropna().value_counts().head(10), check_names=False,
+            check_index_type=False,
+        )
+        pd.testing.assert_series_equal(
+            cube_mitra.top(mask), sub["mitra"].value_counts().head(10), check_names=False, check_index_type=False,
+        )
+        expected = sub["posisi_magang"].value_counts().head(10)
+        expected = expected[expected > 0]
+        assert cube_posisi.top(mask).to_dict() == expected.to_dict()
+
+def test_sum_cube_matches_groupby_and_skips_nulls():
+    df, kota = sample()
+    jumlah = cubes.jumlah_values(df)
+    cube = cubes.list_cube(kota, jumlah)
+    mask = np.arange(len(df)) % 3 != 0
+    exploded = df[mask].explode("kota_list").dropna(subset=["kota_list"])
+    expected = exploded.groupby("kota_list")["jumlah"].sum().astype("int64")
+    got = cube.summary(mask, k=10, by="jumlah").set_index("value")["jumlah"]
+    assert got.to_dict() == expected.to_dict()
+    assert list(got) == sorted(got, reverse=True)
+    assert cubes.total_sum(df["jumlah"].to_numpy(), mask) == int(df["jumlah"][mask].sum())
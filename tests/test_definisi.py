@@ -0,0 +1,27 @@
+import json, threading
+from myapp import definisi, pipeline
+
+def test_prefetch_merges_with_entries_written_meanwhile(tmp_path, monkeypatch):
+    # Proses lain menulis cache selama fetch berjalan; entrinya tidak boleh hilang
+    path = tmp_path / "definisi_cache.json"
+    path.write_text(json.dumps({"lama": {"text": "ada", "fetched": 1.0}}), encoding="utf-8")
+
+    def fetch(key, session):
+        if key == "robotika":
+            other = json.loads(path.read_text("utf-8"))
+            other["lain"] = {"text": "proses lain", "fetched": 2.0}
+            path.write_text(json.dumps(other), encoding="utf-8")
+        return f"definisi {key}"
+
+    monkeypatch.setattr(definisi, "fetch", fetch)
+    monkeypatch.setattr(definisi, "bundled", lambda: {})
+    assert definisi.prefetch(["Robotika", "Kuantum"], path, workers=1) == 2
+    assert sorted(json.loads(path.read_text("utf-8"))) == ["kuantum", "lain", "lama", "robotika"]
+
+def test_pipeline_does_not_prefetch(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    calls = []
+    monkeypatch.setattr(definisi, "prefetch", lambda *a, **k: calls.append(a))
+    before = threading.active_count()
+    pipeline.Pipeline({"latest": None, "current": {}})
+    assert calls == [] and threading.active_count() == before
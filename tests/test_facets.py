@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+from myapp import facets, lokasi
+
+POSISI = pd.Series(["Data Analyst", "Senior Data Analyst", "Web Developer", "Analyst", None, "data analyst"])
+KOTA = pd.Series([["Kota Bandung"], ["Kabupaten Bandung Barat"], [], ["Kota Bandung", "Kota Cimahi"], ["Kota Bogor"], []])
+
+def reference(values: list, selected: list) -> np.ndarray:
+    # Semantik lama: opsi terpilih yang dikenal cocok sebagai substring (case-insensitive) nilai baris
+    options = {str(v) for vs in values for v in vs}
+    needles = [s.lower() for s in selected if s in options]
+    return np.array([any(n in str(v).lower() for n in needles for v in vs) for vs in values])
+
+def check(index: facets.FacetIndex, values: list, selected: list) -> None:
+    got = facets.resolve({"f": index}, {"f": selected}, len(values))
+    assert got.tolist() == reference(values, selected).tolist()
+
+def test_substring_expansion_matches_reference():
+    posisi = facets.single_facet(POSISI, substring=True)
+    kota = facets.list_facet(lokasi.ListColumn.from_lists(KOTA), substring=True)
+    posisi_values = [[v] if v is not None else [] for v in POSISI]
+    for sel in (["Analyst"], ["Data Analyst"], ["Web Developer", "Analyst"], ["tidak ada"], []):
+        if sel:
+            check(posisi, posisi_values, sel)
+    for sel in (["Kota Bandung"], ["Kabupaten Bandung Barat"], ["Kota Cimahi", "Kota Bogor"], ["Bandung"]):
+        check(kota, list(KOTA), sel)
+
+def test_exact_facet_does_not_expand():
+    mitra = facets.single_facet(pd.Series(["PT A", "PT AB", "PT A"]))
+    assert facets.resolve({"mitra": mitra}, {"mitra": ["PT A"]}, 3).tolist() == [True, False, True]
+
+def test_bitmaps_stay_one_per_option():
+    posisi = facets.single_facet(POSISI, substring=True)
+    assert posisi.bits.shape == (len(posisi.options), 1)
+    assert sorted(posisi.options[i] for i in posisi.ids(["Analyst"])) == [
+        "Analyst", "Data Analyst", "Senior Data Analyst", "data analyst",
+    ]
@@ -0,0 +1,46 @@
+import json
+import pytest
+from myapp import fetcher
+
+def crawl_ids(pages) -> list:
+    return [row["id_lowongan"] for page in pages for row in page["props"]["data"]["data"]]
+
+def all_ids(stub_server) -> list:
+    return [row["id_lowongan"] for row in stub_server.ROWS]
+
+@pytest.mark.parametrize("cursor_only", [False, True])
+def test_iter_pages_and_write_snapshot(stub, tmp_path, monkeypatch, cursor_only):
+    stub_server, base = stub
+    monkeypatch.setattr(stub_server, "CURSOR_ONLY", cursor_only)
+    url = f"{base}/magang/lowongan"
+    assert crawl_ids(fetcher.iter_pages(url, per_page=50, workers=3)) == all_ids(stub_server)
+
+    path = tmp_path / "data-01-07-2025.json"
+    total = fetcher.write_snapshot(fetcher.iter_pages(url, per_page=50, workers=3), path)
+    saved = json.loads(path.read_text("utf-8"))
+    assert total == len(stub_server.ROWS)
+    assert [r["id_lowongan"] for r in saved["props"]["data"]["data"]] == all_ids(stub_server)
+    assert not list(tmp_path.glob("*.tmp"))
+
+@pytest.mark.parametrize("cursor_only", [False, True])
+def test_asset_version_bump_falls_back_to_html(stub, monkeypatch, cursor_only):
+    # Versi aset berubah setelah halaman 1: server menjawab 409, fetcher mengambil HTML penuh
+    stub_server, base = stub
+    monkeypatch.setattr(stub_server, "CURSOR_ONLY", cursor_only)
+    monkeypatch.setitem(stub_server.PAGE, "version", "v-lama")
+    pages = fetcher.iter_pages(f"{base}/magang/lowongan", per_page=100, workers=2)
+    first = next(pages)
+    monkeypatch.setitem(stub_server.PAGE, "version", "v-baru")
+    rest = list(pages)
+    assert first["version"] == "v-lama" and all(p["version"] == "v-baru" for p in rest)
+    assert crawl_ids([first, *rest]) == all_ids(stub_server)
+
+def test_write_snapshot_removes_tmp_on_error(stub, tmp_path):
+    _, base = stub
+    def broken():
+        yield from fetcher.iter_pages(f"{base}/magang/lowongan", per_page=50)
+        raise RuntimeError("koneksi putus")
+    path = tmp_path / "data-01-07-2025.json"
+    with pytest.raises(RuntimeError):
+        fetcher.write_snapshot(broken(), path)
+    assert not path.exists() and not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+from myapp import gazetteer, lokasi
+
+APINDO = (
+    "Sekretariat APINDO - Dewan Pimpinan Provinsi\nLampung: \nJl. Pagar Alam No.61, Kedaton, Kec. Kedaton, Kota \n"
+    "Bandar Lampung, Lampung 35132\nKepulauan Riau: Komp. Perkantoran Menara Aria Lt. 7 \nHarbor Bay, Sei. Jodoh, "
+    "Kec. Batu Ampar, Kota \nBatam, Kepulauan Riau, 29444.\nSumatera Utara: Grand Jati Junction, Lt.25 \n"
+    "Jalan Perintis Kemerdekaan No.3A, Kelurahan Perintis\nkecamatan Medan Timur, Kota Medan, Kode Pos \n20111\n"
+    "DKI Jakarta: Graha Mampang Lantai 6, Jl. Mampang \nPrapatan No. 100, RT.10/RW.3, Tegal Parang, \n"
+    "Mampang Prapatan, RT.2/RW.1 12760 Daerah \nKhusus Ibukota Jakarta Jawa"
+)
+
+def hits(text: str) -> list:
+    # Jalur yang sama dengan ingest: field terstruktur dulu, teks bebas sebagai cadangan
+    tbl = lokasi.normalise(pd.DataFrame({"lokasi_penempatan": [text]}), gazetteer.build())
+    return list(zip(tbl["level"].astype(str), tbl["loc"].astype(str)))
+
+@pytest.mark.parametrize("name", ["Bengkulu", "Jambi", "Gorontalo"])
+def test_province_line_has_no_bare_kota(name):
+    assert hits(f"Provinsi : {name}") == [("provinsi", name)]
+
+def test_explicit_kota_still_matches():
+    assert hits("Provinsi : Jambi\nKota : Jambi") == [("provinsi", "Jambi"), ("kota", "Kota Jambi")]
+    assert hits("Bekasi") == [("kota", "Kota Bekasi")]
+
+def test_field_label_does_not_leak_into_match():
+    text = "Provinsi : Jawa Barat\nKabupaten/Kota : Bandung Barat\nKecamatan : Lembang"
+    assert hits(text) == [("provinsi", "Jawa Barat"), ("kota", "Kabupaten Bandung Barat")]
+
+def test_kecamatan_value_dropped_not_whole_line():
+    assert hits("Kecamatan Batu, Kota Malang") == [("kota", "Kota Malang")]
+    assert hits("Provinsi : Jawa Timur\nKecamatan : Batu\nKabupaten/Kota : Malang") == [
+        ("provinsi", "Jawa Timur"), ("kota", "Kota Malang"),
+    ]
+
+def test_free_text_streets_and_districts_are_not_cities():
+    # (Kota Batam tidak ada di wilayah_id.txt bawaan)
+    kota = sorted(loc for level, loc in hits(APINDO) if level == "kota")
+    assert kota == ["Kota Bandar Lampung", "Kota Medan"]
+
+def test_wrapped_field_value_and_missing_level_fallback():
+    text = "Provinsi : Daerah Khusus Jakarta\nKabupaten/Kota : Kota Administrasi Jakarta\nPusat\nKecamatan : Tanah Abang"
+    assert hits(text) == [("provinsi", "DKI Jakarta"), ("kota", "Kota Jakarta Pusat")]
+    # Field provinsi tidak ada: level itu diambil dari teks bebas
+    assert hits("Kabupaten/Kota : Kota Medan Provinsi Sumatera Utara") == [
+        ("kota", "Kota Medan"), ("provinsi", "Sumatera Utara"),
+    ]
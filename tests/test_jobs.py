@@ -0,0 +1,54 @@
+import itertools
+import pytest
+from myapp import jobs, llm
+
+@pytest.fixture
+def llm_stub(stub, monkeypatch):
+    stub_server, base = stub
+    monkeypatch.setattr(llm, "API_BASE", f"{base}/api/v1")
+    return stub_server
+
+def run_jobs(queue: jobs.JobQueue, keys: list) -> list:
+    # Prompt berbeda per job: request identik akan digabung (coalesce) oleh llm.chat
+    ids = [
+        queue.submit(llm.chat, [{"role": "user", "content": f"job {i}"}], "stub/model", k, False, key=k)
+        for i, k in enumerate(keys)
+    ]
+    return queue.wait(ids, timeout=60)
+
+def test_per_key_concurrency_limit(llm_stub, monkeypatch):
+    monkeypatch.setattr(llm_stub, "LLM_DELAY", 0.2)
+    result = run_jobs(jobs.JobQueue(per_key=2), ["sk-a"] * 6 + ["sk-b"] * 6)
+    assert all(j["status"] == "done" and j["attempts"] == 1 for j in result)
+    assert llm_stub.STATS["peak"] == 2 and llm_stub.STATS["rate_limited"] == 0
+
+def test_retries_after_429(llm_stub, monkeypatch):
+    # Antrean mengizinkan 3 bersamaan, server hanya 1: sisanya kena 429 lalu diulang
+    monkeypatch.setattr(llm_stub, "KEY_LIMIT", 1)
+    monkeypatch.setattr(llm_stub, "LLM_DELAY", 0.1)
+    result = run_jobs(jobs.JobQueue(per_key=3, max_attempts=8, backoff_base=0.05), ["sk-a"] * 3)
+    assert all(j["status"] == "done" for j in result)
+    assert llm_stub.STATS["rate_limited"] > 0 and sum(j["attempts"] for j in result) > 3
+
+def test_retries_after_503(llm_stub, monkeypatch):
+    # Dua jawaban 503 lalu sukses
+    rolls = itertools.chain([0.0, 0.0], itertools.repeat(1.0))
+    monkeypatch.setattr(llm_stub, "FAIL_RATE", 0.5)
+    monkeypatch.setattr(llm_stub.random, "random", lambda: next(rolls))
+    [job] = run_jobs(jobs.JobQueue(backoff_base=0.05), ["sk-a"])
+    assert job["status"] == "done" and job["attempts"] == 3 and llm_stub.STATS["failed"] == 2
+
+def test_retries_exhausted(llm_stub, monkeypatch):
+    monkeypatch.setattr(llm_stub, "FAIL_RATE", 1.0)
+    [job] = run_jobs(jobs.JobQueue(max_attempts=2, backoff_base=0.05), ["sk-a"])
+    assert job["status"] == "failed" and job["attempts"] == 2 and "503" in job["error"]
+
+def test_401_fails_without_retry(llm_stub):
+    [job] = run_jobs(jobs.JobQueue(backoff_base=0.05), [llm_stub.INVALID_KEY])
+    assert job["status"] == "failed" and job["attempts"] == 1 and llm_stub.STATS["chat"] == 1
+
+def test_backoff_jitter_and_retry_after():
+    delays = [jobs.backoff(3, base=1.0) for _ in range(50)]
+    assert all(2.0 <= d <= 4.0 for d in delays) and len(set(delays)) > 1
+    assert jobs.backoff(1, retry_after=5.0, base=1.0) == 5.0
+    assert jobs.backoff(20, base=1.0) <= jobs.BACKOFF_MAX
@@ -0,0 +1,58 @@
+import threading, time
+import pytest
+from myapp import llm
+
+@pytest.fixture
+def llm_stub(stub, monkeypatch, tmp_path):
+    # Cache sqlite (data_store/ relatif) di folder sementara; stats dihitung dari nol
+    stub_server, base = stub
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(llm, "API_BASE", f"{base}/api/v1")
+    monkeypatch.setattr(llm, "stats", {k: 0 for k in llm.stats})
+    monkeypatch.setattr(stub_server, "LLM_DELAY", 0.3)
+    return stub_server
+
+def timed_chat(prompt: str) -> tuple[str, float]:
+    t0 = time.perf_counter()
+    out = llm.chat([{"role": "user", "content": prompt}], "stub/model", "sk-a")
+    return out, time.perf_counter() - t0
+
+def test_cache_hit_rate_and_latency(llm_stub):
+    first, cold = timed_chat("evaluasi cv")
+    repeats = [timed_chat("evaluasi cv") for _ in range(4)]
+    assert all(out == first for out, _ in repeats)
+    assert llm_stub.STATS["chat"] == 1
+    assert llm.stats == {"hit": 4, "miss": 1, "coalesced": 0}
+    assert cold >= llm_stub.LLM_DELAY and max(t for _, t in repeats) < llm_stub.LLM_DELAY / 3
+
+def test_cache_expires_after_ttl(llm_stub):
+    messages = [{"role": "user", "content": "posisi data analyst"}]
+    llm.chat(messages, "stub/model", "sk-a")
+    llm.chat(messages, "stub/model", "sk-a", ttl=0)
+    assert llm_stub.STATS["chat"] == 2 and llm.stats["hit"] == 0
+
+def test_identical_requests_coalesce(llm_stub):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(timed_chat("sama")[0])) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(set(results)) == 1 and llm_stub.STATS["chat"] == 1
+    assert llm.stats["miss"] == 1 and llm.stats["hit"] + llm.stats["coalesced"] == 5
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    for i in range(4):
+        llm.cache_put(f"k{i}", "m", "x" * 100, max_bytes=250, path=path)
+        time.sleep(0.01)
+    assert [llm.cache_get(f"k{i}", path=path) is not None for i in range(4)] == [False, False, True, True]
+
+def test_cache_is_separate_per_base_url(llm_stub, monkeypatch, stub):
+    # Balasan dari satu endpoint tidak disajikan untuk endpoint lain dengan prompt yang sama
+    messages = [{"role": "user", "content": "evaluasi cv"}]
+    llm.chat(messages, "stub/model", "sk-a")
+    monkeypatch.setattr(llm, "API_BASE", f"{stub[1]}/v2/api/v1")
+    llm.chat(messages, "stub/model", "sk-a")
+    assert llm_stub.STATS["chat"] == 2 and llm.stats["hit"] == 0
+    assert llm.cache_key("m", messages, "http://a") != llm.cache_key("m", messages, "http://b")
@@ -0,0 +1,29 @@
+import numpy as np
+from myapp import pipeline, recommend, store
+from conftest import ROOT, write_snapshot
+
+EMPTY_HEAD = {"latest": None, "current": {}}
+NO_FILTER = {"posisi": [], "provinsi": [], "kota": [], "mitra": []}
+
+def test_empty_store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pipe = pipeline.Pipeline(EMPTY_HEAD)
+    assert len(pipe.df) == 0
+    assert pipe.filter_mask(NO_FILTER, baru=True, keyword="data", query="analyst").shape == (0,)
+    assert pipe.cubes["kota"].top(None).empty and pipe.facets["provinsi"].options == []
+    assert len(recommend.rank(pipe.recommender, "data analyst", np.arange(0))) == 0
+
+def test_shared_dataset_is_not_copied_per_call(tmp_path, monkeypatch, template_rows):
+    # Pemanggil mendapat dataset bersama (tanpa salinan per akses) dan menyalin sendiri bila perlu mengubah
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "wilayah_id.txt").symlink_to(ROOT / "wilayah_id.txt")
+    write_snapshot(tmp_path / "data_lowongan", "01-07-2025", template_rows[:20])
+    head = store.catalog_head(store.ingest(["data_lowongan"]))
+    pipe = pipeline.Pipeline(head)
+    assert pipe.df is pipe.df and pipe.trends is pipe.trends
+    before = pipe.df.copy()
+    df = pipe.df.copy()
+    df.loc[0, "jumlah"] = 99
+    df["slug"] = "diubah"
+    assert pipe.df.equals(before)
+    assert pipe.filter_mask(NO_FILTER).sum() == 20
@@ -0,0 +1,57 @@
+import builtins, importlib, sys, types
+from myapp import profiling
+
+def test_works_without_resource_module(tmp_path, monkeypatch):
+    # Windows: modul resource tidak ada (dan psutil belum tentu terpasang)
+    real_import = builtins.__import__
+    def no_unix(name, *args, **kwargs):
+        if name in ("resource", "psutil"):
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+    monkeypatch.delitem(sys.modules, "resource", raising=False)
+    monkeypatch.setattr(builtins, "__import__", no_unix)
+    mod = importlib.reload(profiling)
+    assert mod.peak_rss_mb() is None
+
+    mod.start(True, "uji")
+    with mod.stage("filter"):
+        pass
+    record = mod.finish(path=tmp_path / "profile.jsonl")
+    assert record["peak_rss_mb"] is None and "filter" in record["stages"]
+
+def test_disabled_run_records_nothing(tmp_path):
+    profiling.start(False)
+    with profiling.stage("filter"):
+        profiling.count("x")
+    assert profiling.finish(path=tmp_path / "profile.jsonl") is None
+    assert not (tmp_path / "profile.jsonl").exists()
+
+def fake_resource(maxrss: int):
+    return types.SimpleNamespace(
+        RUSAGE_SELF=0, getrusage=lambda who: types.SimpleNamespace(ru_maxrss=maxrss),
+    )
+
+def test_peak_rss_units_per_platform(monkeypatch):
+    # ru_maxrss dalam KiB di Linux, byte di macOS
+    monkeypatch.setitem(sys.modules, "resource", fake_resource(512 * 2**20))
+    monkeypatch.setattr(profiling.sys, "platform", "darwin")
+    assert profiling.peak_rss_mb() == 512
+    monkeypatch.setitem(sys.modules, "resource", fake_resource(512 * 1024))
+    monkeypatch.setattr(profiling.sys, "platform", "linux")
+    assert profiling.peak_rss_mb() == 512
+
+def test_current_rss_is_none_without_a_source(monkeypatch):
+    # Tanpa /proc dan psutil: RSS saat ini tidak diketahui, bukan diganti nilai puncak
+    real_open, real_import = builtins.open, builtins.__import__
+    def no_proc(path, *args, **kwargs):
+        if str(path).startswith("/proc/"):
+            raise OSError(path)
+        return real_open(path, *args, **kwargs)
+    def no_psutil(name, *args, **kwargs):
+        if name == "psutil":
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+    monkeypatch.setattr(builtins, "open", no_proc)
+    monkeypatch.setattr(builtins, "__import__", no_psutil)
+    assert profiling.rss_mb() is None
+    assert profiling.peak_rss_mb() is not None
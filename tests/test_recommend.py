@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+from myapp import recommend, store
+from conftest import posting, write_snapshot
+
+DF = pd.DataFrame({
+    "posisi_magang": ["Data Analyst", "Web Developer", "Data Engineer", "Graphic Designer", "Analyst Keuangan"],
+    "deskripsi": [
+        "Mengolah data penjualan dengan SQL",
+        "Membangun website dengan React",
+        "Membangun pipeline data dan SQL",
+        "Desain visual untuk media sosial",
+        "Analisis laporan keuangan dan data",
+    ],
+})
+
+def test_rank_orders_by_bm25_and_respects_candidates():
+    rec = recommend.Recommender.build(DF)
+    assert rec.n_rows == len(DF)
+    top = recommend.rank(rec, "data analyst", np.arange(len(DF)), k=3)
+    assert top[0] == 0 and set(top) <= {0, 2, 4}
+    # Hanya kandidat (hasil filter) yang boleh muncul
+    assert recommend.rank(rec, "data analyst", np.array([1, 2, 3])).tolist() == [2]
+    assert len(recommend.rank(rec, "tidak ada", np.arange(len(DF)))) == 0
+
+def test_rank_expansion_only_reorders_pool():
+    rec = recommend.Recommender.build(DF)
+    base = recommend.rank(rec, "data", np.arange(len(DF)))
+    expanded = recommend.rank(rec, "data", np.arange(len(DF)), keywords=["pipeline"])
+    assert sorted(base) == sorted(expanded) and expanded[0] == 2
+
+def test_save_load_round_trip(tmp_path):
+    rec = recommend.Recommender.build(DF)
+    path = tmp_path / "bm25__x.npz"
+    rec.save(path)
+    loaded = recommend.Recommender.load(path)
+    tokens = recommend.query_tokens("data sql")
+    np.testing.assert_allclose(loaded.scores(tokens), rec.scores(tokens))
+
+def test_old_bm25_files_are_pruned(tmp_path, template_rows):
+    # Simpan matriks versi aktif + sebelumnya; versi lebih lama dibuang saat dataset aktif berganti
+    folder, store_dir = tmp_path / "data_lowongan", tmp_path / "data_store"
+    base = template_rows[0]
+    sigs = []
+    for day, ids in (("01", (1, 2)), ("02", (2, 3)), ("03", (3, 4))):
+        write_snapshot(folder, f"{day}-07-2025", [posting(base, i) for i in ids])
+        store.ingest([folder.as_posix()], store_dir)
+        df, _ = store.load_compact(folder.as_posix(), store_dir)
+        recommend.load_or_build(df, store_dir)
+        sigs.append(df.attrs["snapshot"])
+    assert recommend.matrix_path(sigs[2], store_dir).exists() and recommend.matrix_path(sigs[1], store_dir).exists()
+    assert not recommend.matrix_path(sigs[0], store_dir).exists()
@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+from myapp import search
+
+DF = pd.DataFrame({
+    "posisi_magang": pd.Series(["Programmer C++", "Data Analyst (Junior)", "Web Developer"], dtype="category"),
+    "deskripsi": ["Menguasai C++ dan *nix", "Analisis data (SQL)", None],
+})
+
+@pytest.mark.parametrize("query, expected", [
+    ("(", [False, True, False]),
+    ("c++", [True, False, False]),
+    ("*", [True, False, False]),
+    ("JUNIOR)", [False, True, False]),
+])
+def test_substring_mask_is_literal(query, expected):
+    assert search.substring_mask(DF, query, ["posisi_magang", "deskripsi"]).tolist() == expected
+
+INDEX = search.InvertedIndex(pd.Series([
+    "Kemampuannya mengolah data",
+    "Analisis data penjualan",
+    "Data analyst magang",
+    None,
+    "Desainer grafis",
+]))
+
+def test_lookup_prefix_and_exact():
+    assert INDEX.lookup("anal").tolist() == [1, 2]
+    assert INDEX.lookup("anal", prefix=False).tolist() == []
+    assert INDEX.lookup("data", prefix=False).tolist() == [0, 1, 2]
+
+def test_search_intersects_all_tokens():
+    assert INDEX.search("data anal").tolist() == [1, 2]
+    assert INDEX.search("data desain").tolist() == []
+    assert INDEX.search("((") is None
+
+def test_nya_suffix_is_stemmed():
+    # "kemampuannya" juga terindeks sebagai "kemampuan"; kata pendek berakhiran -nya tidak dipotong
+    assert INDEX.search("kemampuan", prefix=False).tolist() == [0]
+    assert search.index_tokens("punya hanya") == ["punya", "hanya"]
@@ -0,0 +1,69 @@
+import pathlib
+from myapp import store
+from conftest import posting, write_snapshot
+
+def test_closed_postings_leave_current(tmp_path, template_rows):
+    folder, store_dir = tmp_path / "data_lowongan", tmp_path / "data_store"
+    base = template_rows[0]
+    write_snapshot(folder, "01-07-2025", [posting(base, 1), posting(base, 2), posting(base, 3)])
+    store.ingest([folder.as_posix()], store_dir)
+    assert len(store.load_current(folder.as_posix(), store_dir)) == 3
+
+    write_snapshot(folder, "02-07-2025", [posting(base, 1), posting(base, 3)])
+    store.ingest([folder.as_posix()], store_dir)
+    df = store.load_current(folder.as_posix(), store_dir)
+    assert sorted(df["id_lowongan"]) == [1, 3]
+    compact, lists = store.load_compact(folder.as_posix(), store_dir)
+    assert len(compact) == len(lists["provinsi"]) == 2
+
+def test_edit_wins_over_version_without_updated_at(tmp_path, template_rows):
+    folder, store_dir = tmp_path / "data_lowongan", tmp_path / "data_store"
+    base = template_rows[0]
+    write_snapshot(folder, "01-07-2025", [posting(base, 1, updated_at=None, deskripsi="lama")])
+    write_snapshot(folder, "02-07-2025", [posting(base, 1, updated_at="2025-07-02T08:00:00.000000Z", deskripsi="baru")])
+    store.ingest([folder.as_posix()], store_dir)
+    assert store.load_current(folder.as_posix(), store_dir)["deskripsi"].tolist() == ["baru"]
+
+    # Edit berikutnya dengan updated_at lebih lama dari versi aktif tidak menimpa
+    write_snapshot(folder, "03-07-2025", [posting(base, 1, updated_at="2025-07-01T08:00:00.000000Z", deskripsi="mundur")])
+    store.ingest([folder.as_posix()], store_dir)
+    assert store.load_current(folder.as_posix(), store_dir)["deskripsi"].tolist() == ["baru"]
+
+def test_newer_version_rules():
+    import pandas as pd
+    new = pd.Series(["|2025-07-02", "2025-07-01T00:00:00Z|2025-07-02", "2025-07-03T00:00:00Z|2025-07-02"])
+    old = pd.Series(["2025-07-05T00:00:00Z|2025-07-01", "2025-07-02T00:00:00Z|2025-07-01", "|2025-07-03"])
+    assert store.newer_version(new, old).tolist() == [True, False, False]
+
+def test_csv_export_keeps_pinned_rows(tmp_path, template_rows):
+    # Sesi yang memegang dataset lama tetap mengekspor baris yang sama setelah ingest berikutnya
+    from myapp import tab_data
+    import pandas as pd
+    import numpy as np
+    folder, store_dir = tmp_path / "data_lowongan", tmp_path / "data_store"
+    base = template_rows[0]
+    write_snapshot(folder, "01-07-2025", [posting(base, i) for i in (1, 2, 3)])
+    store.ingest([folder.as_posix()], store_dir)
+    pinned, _ = store.load_compact(folder.as_posix(), store_dir)
+    export = tab_data.csv_stream(pinned, np.array([1, 2]))
+
+    write_snapshot(folder, "02-07-2025", [posting(base, i) for i in (3, 4)])
+    store.ingest([folder.as_posix()], store_dir)
+    current, _ = store.load_compact(folder.as_posix(), store_dir)
+    assert current.attrs["rows_path"] != pinned.attrs["rows_path"]
+    assert pd.read_csv(export())["slug"].tolist() == ["lowongan-2", "lowongan-3"]
+
+    # Versi yang sudah dibuang: ekspor dari kolom di memori
+    write_snapshot(folder, "03-07-2025", [posting(base, i) for i in (4, 5)])
+    store.ingest([folder.as_posix()], store_dir)
+    assert not pathlib.Path(pinned.attrs["rows_path"]).exists()
+    assert pd.read_csv(export())["slug"].tolist() == ["lowongan-2", "lowongan-3"]
+    assert len(list(store_dir.glob("current__data_lowongan__*.parquet"))) == 4
+
+def test_null_jumlah_loads_as_zero(tmp_path, template_rows):
+    folder, store_dir = tmp_path / "data_lowongan", tmp_path / "data_store"
+    base = template_rows[0]
+    write_snapshot(folder, "01-07-2025", [posting(base, 1, jumlah=None), posting(base, 2, jumlah=3)])
+    store.ingest([folder.as_posix()], store_dir)
+    df, _ = store.load_compact(folder.as_posix(), store_dir)
+    assert df["jumlah"].dtype.kind == "i" and df["jumlah"].tolist() == [0, 3]
@@ -0,0 +1,42 @@
+from myapp import store
+from conftest import posting, write_snapshot
+
+def trend_row(trends, date: str, mitra: str) -> dict:
+    row = trends[(trends["date"] == date) & (trends["dim"] == "mitra") & (trends["value"] == mitra)]
+    return row[["postings", "added", "removed"]].iloc[0].to_dict() if len(row) else {}
+
+def test_churn_is_attributed_to_the_right_values(tmp_path, template_rows):
+    folder, store_dir = tmp_path / "data_lowongan", tmp_path / "data_store"
+    base = template_rows[0]
+    write_snapshot(folder, "01-07-2025", [posting(base, 1, mitra="PT A"), posting(base, 2, mitra="PT B")])
+    write_snapshot(folder, "02-07-2025", [posting(base, 2, mitra="PT B"), posting(base, 3, mitra="PT A")])
+    store.ingest([folder.as_posix()], store_dir)
+    trends = store.load_trends(store_dir)
+    day2 = trends["date"].max()
+    assert trend_row(trends, day2, "PT A") == {"postings": 1, "added": 1, "removed": 1}
+    assert trend_row(trends, day2, "PT B") == {"postings": 1, "added": 0, "removed": 0}
+    semua = trends[(trends["date"] == day2) & (trends["dim"] == "semua")].iloc[0]
+    assert (semua["postings"], semua["added"], semua["removed"]) == (2, 1, 1)
+
+def test_only_new_or_changed_snapshots_are_recomputed(tmp_path, template_rows, monkeypatch):
+    folder, store_dir = tmp_path / "data_lowongan", tmp_path / "data_store"
+    base = template_rows[0]
+    write_snapshot(folder, "01-07-2025", [posting(base, 1, mitra="PT A")])
+    write_snapshot(folder, "02-07-2025", [posting(base, 1, mitra="PT A"), posting(base, 2, mitra="PT B")])
+    store.ingest([folder.as_posix()], store_dir)
+
+    computed = []
+    snapshot_trend = store.snapshot_trend
+    monkeypatch.setattr(store, "snapshot_trend", lambda m, k, ent: computed.append(ent["date"]) or snapshot_trend(m, k, ent))
+    write_snapshot(folder, "03-07-2025", [posting(base, 2, mitra="PT B")])
+    store.ingest([folder.as_posix()], store_dir)
+    assert computed == ["2025-07-03"]
+
+    # Snapshot lama berubah: dirinya dan penerusnya (pembanding churn berubah) dihitung ulang
+    computed.clear()
+    write_snapshot(folder, "02-07-2025", [posting(base, 1, mitra="PT A")])
+    store.ingest([folder.as_posix()], store_dir)
+    assert sorted(computed) == ["2025-07-02", "2025-07-03"]
+    trends = store.load_trends(store_dir)
+    assert trend_row(trends, "2025-07-03", "PT A") == {"postings": 0, "added": 0, "removed": 1}
+    assert trend_row(trends, "2025-07-03", "PT B")["added"] == 1